@@ -1,13 +1,65 @@
-import csv
-import json
-import sqlite3
 import os
 import sys
+
+# this file is itself named csv.py; keep its directory (and this module) out of the way
+# so the standard library's csv module is the one that gets imported
+script_dir = os.path.dirname(os.path.abspath(__file__))
+saved_path = sys.path[:]
+saved_module = sys.modules.pop("csv", None)
+sys.path[:] = [entry for entry in sys.path if os.path.abspath(entry or os.curdir) != script_dir]
+try:
+    import csv
+finally:
+    sys.path[:] = saved_path
+    if saved_module is not None:
+        sys.modules["csv"] = saved_module
+
+import json
+import sqlite3
 import glob
 import re
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from itertools import accumulate, chain, islice, repeat
+from operator import add
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 import time
+import math
+import io
+import argparse
+import inspect
+import gzip
+import bz2
+import lzma
+import threading
+import queue
+import mmap
+import hashlib
+import shutil
+import tempfile
+from urllib.request import pathname2url
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+STREAM_BUFFER_SIZE = 1024 * 1024
+SQLITE_FETCH_SIZE = 5000
+SQLITE_EXPORT_WORKERS = 4
+TYPE_SAMPLE_SIZE = 1000
+PARALLEL_CHUNK_SIZE = 8 * 1024 * 1024
+
+LOG_STREAM = None
+LOG_QUIET = False
+CSV_FIELD_SIZE_LIMIT = min(sys.maxsize, 2 ** 31 - 1)
 
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
@@ -23,6 +75,8 @@ def print_banner():
     print("\033[96m" + banner + "\033[0m")
 
 def log(message, level="INFO"):
+    if LOG_QUIET and level != "ERROR":
+        return
     timestamp = datetime.now().strftime("%H:%M:%S")
     colors = {
         "INFO": "\033[94m",
@@ -33,13 +87,17 @@ def log(message, level="INFO"):
         "DEBUG": "\033[90m"
     }
     color = colors.get(level, "\033[0m")
-    print(f"{color}[{timestamp}] {level}: {message}\033[0m")
+    print(f"{color}[{timestamp}] {level}: {message}\033[0m", file=LOG_STREAM or sys.stdout)
 
 def get_files_in_directory(extensions, description="فایل"):
     files = []
     
+    patterns = []
     for ext in extensions:
-        pattern = f"*.{ext}"
+        patterns.append((f"*.{ext}", ext))
+        patterns.extend((f"*.{ext}.{suffix}", f"{ext}.{suffix}") for suffix in COMPRESSION_EXTENSIONS)
+    
+    for pattern, ext in patterns:
         matched_files = glob.glob(pattern)
         for file in matched_files:
             size = os.path.getsize(file)
@@ -115,1057 +173,2774 @@ def select_from_list(items, item_type="آیتم"):
         except KeyboardInterrupt:
             return None
 
-def csv_to_json(csv_path, json_path):
-    try:
-        log(f"شروع تبدیل CSV به JSON", "INFO")
-        
-        if not os.path.exists(csv_path):
-            raise FileNotFoundError(f"فایل CSV یافت نشد: {csv_path}")
-        
-        data = []
-        with open(csv_path, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                data.append(row)
-        
-        log(f"{len(data)} ردیف خوانده شد", "STATS")
-        
-        with open(json_path, 'w', encoding='utf-8') as jsonfile:
-            json.dump(data, jsonfile, indent=2, ensure_ascii=False)
-        
-        log(f"فایل JSON با موفقیت ایجاد شد: {json_path}", "SUCCESS")
+COMPRESSION_EXTENSIONS = {"gz": "gzip", "bz2": "bz2", "xz": "xz", "zst": "zstd"}
+COMPRESSION_SUFFIXES = {"gzip": "gz", "bz2": "bz2", "xz": "xz", "zstd": "zst"}
+COMPRESSION_MAGIC = [
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+]
+DECOMPRESS_QUEUE_DEPTH = 8
+
+def split_compression_ext(path):
+    base, ext = os.path.splitext(path)
+    codec = COMPRESSION_EXTENSIONS.get(ext.lower().lstrip('.'))
+    return (base, codec) if codec else (path, None)
+
+def detect_compression(path):
+    if os.path.isfile(path):
+        with open(path, 'rb') as f:
+            head = f.read(6)
+        for magic, codec in COMPRESSION_MAGIC:
+            if head.startswith(magic):
+                return codec
+        return None
+    return split_compression_ext(path)[1]
+
+def open_compressed_binary(path, codec, mode):
+    if codec == "gzip":
+        return gzip.open(path, mode + 'b', compresslevel=6)
+    if codec == "bz2":
+        return bz2.open(path, mode + 'b')
+    if codec == "xz":
+        return lzma.open(path, mode + 'b')
+    if zstandard is None:
+        raise ValueError("برای فایل‌های zstd بسته zstandard لازم است")
+    if mode == 'r':
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), read_size=STREAM_BUFFER_SIZE)
+    return zstandard.ZstdCompressor().stream_writer(open(path, mode + 'b'))
+
+class BackgroundReader(io.RawIOBase):
+    # decompresses on a worker thread so codec time overlaps with parsing;
+    # zlib, bz2, lzma and zstd all release the GIL while they work
+    
+    def __init__(self, stream, chunk_size=STREAM_BUFFER_SIZE, depth=DECOMPRESS_QUEUE_DEPTH):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.chunks = queue.Queue(depth)
+        self.pending = memoryview(b"")
+        self.error = None
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.fill, daemon=True)
+        self.thread.start()
+    
+    def fill(self):
+        try:
+            while not self.stopped.is_set():
+                chunk = self.stream.read(self.chunk_size)
+                self.put(chunk)
+                if not chunk:
+                    return
+        except Exception as e:
+            self.error = e
+            self.put(b"")
+    
+    def put(self, chunk):
+        while not self.stopped.is_set():
+            try:
+                self.chunks.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+    
+    def readable(self):
         return True
-        
-    except Exception as e:
-        log(f"خطا در تبدیل CSV به JSON: {str(e)}", "ERROR")
-        return False
+    
+    def readinto(self, buffer):
+        if not self.pending:
+            chunk = self.chunks.get()
+            if not chunk:
+                self.chunks.put(b"")
+                if self.error:
+                    raise self.error
+                return 0
+            self.pending = memoryview(chunk)
+        
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        return size
+    
+    def close(self):
+        if not self.closed:
+            self.stopped.set()
+            self.thread.join()
+            self.stream.close()
+        super().close()
 
-def csv_to_sqlite(csv_path, db_path, table_name="data"):
-    try:
-        log(f"شروع تبدیل CSV به SQLite", "INFO")
-        
-        if not os.path.exists(csv_path):
-            raise FileNotFoundError(f"فایل CSV یافت نشد: {csv_path}")
-        
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        with open(csv_path, 'r', encoding='utf-8') as csvfile:
-            lines = csvfile.readlines()
-            
-            if not lines:
-                raise ValueError("فایل CSV خالی است")
+def open_text_stream(path, mode='r', newline=None):
+    codec = detect_compression(path) if mode == 'r' else split_compression_ext(path)[1]
+    if not codec:
+        return open(path, mode, encoding='utf-8', newline=newline, buffering=STREAM_BUFFER_SIZE)
+    
+    stream = open_compressed_binary(path, codec, mode)
+    if mode == 'r':
+        stream = io.BufferedReader(BackgroundReader(stream), STREAM_BUFFER_SIZE)
+    else:
+        stream = io.BufferedWriter(stream, STREAM_BUFFER_SIZE)
+    return io.TextIOWrapper(stream, encoding='utf-8', newline=newline)
 
-            first_line = lines[0].strip()
-            delimiters = [',', ';', '\t', '|', ':', '#', '~']
-            delimiter = ','
-            
-            for delim in delimiters:
-                if delim in first_line:
-                    delimiter = delim
-                    break
-            
-            log(f"جداکننده تشخیص داده شده: '{delimiter}'", "STATS")
-            
-            headers = first_line.strip().split(delimiter)
-            log(f"تعداد ستون‌ها: {len(headers)}", "STATS")
+def iter_delimited_batches(textfile, delimiter, column_count, batch_size=1000, strict=False):
+    batch = []
+    for line in textfile:
+        line = line.strip()
+        if not line:
+            continue
 
-            create_table_sql = f"""
-            CREATE TABLE IF NOT EXISTS {table_name} (
-                {', '.join([f'"{col}" TEXT' for col in headers])}
-            )
-            """
-            cursor.execute(create_table_sql)
+        values = line.split(delimiter)
+        if strict and len(values) != column_count:
+            continue
+        if len(values) < column_count:
+            values = values + [''] * (column_count - len(values))
+        elif len(values) > column_count:
+            values = values[:column_count]
 
-            insert_sql = f"""
-            INSERT INTO {table_name} ({', '.join([f'"{col}"' for col in headers])})
-            VALUES ({', '.join(['?' for _ in headers])})
-            """
-            
-            row_count = 0
-            batch_size = 1000
-            batch_data = []
-            
-            for i, line in enumerate(lines[1:], 1):
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                values = line.split(delimiter)
-                if len(values) != len(headers):
+        batch.append(values)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
 
-                    values = values + [''] * (len(headers) - len(values))
-                elif len(values) > len(headers):
-                    values = values[:len(headers)]
-                
-                batch_data.append(values)
-                
-                if len(batch_data) >= batch_size:
-                    cursor.executemany(insert_sql, batch_data)
-                    row_count += len(batch_data)
-                    batch_data = []
-                    
-                    if row_count % 10000 == 0:
-                        log(f"تاکنون {row_count} ردیف ذخیره شد", "STATS")
-
-            if batch_data:
-                cursor.executemany(insert_sql, batch_data)
-                row_count += len(batch_data)
-            
-            conn.commit()
-        
-        log(f"{row_count} ردیف در دیتابیس ذخیره شد", "STATS")
-        
-        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-        count = cursor.fetchone()[0]
-        
-        log(f"جدول '{table_name}' ایجاد شد:", "STATS")
-        log(f"  • تعداد سطرها: {count}", "STATS")
-        log(f"  • تعداد ستون‌ها: {len(headers)}", "STATS")
-        
-        conn.close()
-        log(f"دیتابیس SQLite با موفقیت ایجاد شد: {db_path}", "SUCCESS")
-        return True
-        
-    except Exception as e:
-        log(f"خطا در تبدیل CSV به SQLite: {str(e)}", "ERROR")
-        return False
+    if batch:
+        yield batch
+
+def read_line_block(textfile, tail, block_size=STREAM_BUFFER_SIZE):
+    while True:
+        chunk = textfile.read(block_size)
+        if not chunk:
+            return tail, ''
+        
+        tail += chunk
+        cut = tail.rfind('\n')
+        if cut >= 0:
+            return tail[:cut + 1], tail[cut + 1:]
+
+def iter_file_blocks(textfile, block_size=STREAM_BUFFER_SIZE):
+    tail = ''
+    while True:
+        block, tail = read_line_block(textfile, tail, block_size)
+        if not block:
+            return
+        yield block
+
+def open_mapped(path):
+    if not os.path.isfile(path) or not os.path.getsize(path) or detect_compression(path):
+        return None
+    
+    with open(path, 'rb') as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mapping, 'madvise'):
+        mapping.madvise(mmap.MADV_SEQUENTIAL)
+    return mapping
 
-def csv_to_sql(csv_path, sql_path, table_name="data"):
+def close_mapped(mapping):
     try:
-        log(f"شروع تبدیل CSV به SQL", "INFO")
-        
-        if not os.path.exists(csv_path):
-            raise FileNotFoundError(f"فایل CSV یافت نشد: {csv_path}")
-        
-        with open(csv_path, 'r', encoding='utf-8') as csvfile:
-            lines = csvfile.readlines()
-            
-            if not lines:
-                raise ValueError("فایل CSV خالی است")
+        mapping.close()
+    except BufferError:
+        # a scan abandoned mid-way still holds a view; the mapping goes with it
+        pass
 
-            first_line = lines[0].strip()
-            delimiters = [',', ';', '\t', '|', ':', '#', '~']
-            delimiter = ','
-            
-            for delim in delimiters:
-                if delim in first_line:
-                    delimiter = delim
-                    break
-            
-            log(f"جداکننده تشخیص داده شده: '{delimiter}'", "STATS")
+def iter_mapped_blocks(mapping, start=0, end=None, block_size=STREAM_BUFFER_SIZE, ends=None):
+    end = len(mapping) if end is None else end
+    while start < end:
+        stop = min(start + block_size, end)
+        if stop < end:
+            cut = mapping.rfind(b'\n', start, stop)
+            if cut < 0:
+                cut = mapping.find(b'\n', stop, end)
+            stop = end if cut < 0 else cut + 1
+        
+        # decoded straight from the page cache; only this block ever exists as str
+        with memoryview(mapping)[start:stop] as view:
+            block = str(view, 'utf-8')
+        if ends is not None:
+            ends.append(stop)
+        yield block
+        start = stop
 
-            headers = first_line.strip().split(delimiter)
-            
-            data = []
-            for line in lines[1:]:
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                values = line.split(delimiter)
-                if len(values) != len(headers):
-                    values = values + [''] * (len(headers) - len(values))
-                elif len(values) > len(headers):
-                    values = values[:len(headers)]
-                
-                data.append(values)
-        
-        log(f"{len(data)} ردیف خوانده شد", "STATS")
-        
-        with open(sql_path, 'w', encoding='utf-8') as sqlfile:
-            sqlfile.write(f"-- ایجاد جدول {table_name}\n")
-            sqlfile.write(f"CREATE TABLE {table_name} (\n")
-            
-            columns = []
-            for header in headers:
-                columns.append(f"    {header} VARCHAR(255)")
-            
-            sqlfile.write(",\n".join(columns))
-            sqlfile.write("\n);\n\n")
+def iter_universal_blocks(blocks):
+    # what open(..., newline=None) does to a stream: \r\n and a lone \r both end a line
+    for block in blocks:
+        if '\r' in block:
+            block = block.replace('\r\n', '\n').replace('\r', '\n')
+        yield block
 
-            sqlfile.write(f"-- درج داده‌ها در جدول {table_name}\n")
-            
-            batch_size = 500
-            for i in range(0, len(data), batch_size):
-                batch = data[i:i+batch_size]
-                
-                sqlfile.write(f"INSERT INTO {table_name} ({', '.join(headers)}) VALUES\n")
-                
-                values_list = []
-                for row in batch:
-                    escaped_values = []
-                    for value in row:
-                        if not value or value == 'NULL':
-                            escaped_values.append("NULL")
-                        else:
-                            escaped = str(value).replace("'", "''")
-                            escaped_values.append(f"'{escaped}'")
-                    
-                    values_list.append(f"    ({', '.join(escaped_values)})")
-                
-                sqlfile.write(",\n".join(values_list))
-                sqlfile.write(";\n\n")
-        
-        log(f"فایل SQL با موفقیت ایجاد شد: {sql_path}", "SUCCESS")
-        log(f"  • تعداد INSERT statement: {(len(data) + batch_size - 1) // batch_size}", "STATS")
-        return True
-        
-    except Exception as e:
-        log(f"خطا در تبدیل CSV به SQL: {str(e)}", "ERROR")
-        return False
+def open_text_blocks(path, newline=None, start=0, end=None):
+    # ends collects the byte offset of every block handed out, for mapped files only
+    mapping = open_mapped(path)
+    if mapping is not None and newline is None and mapping.find(b'\n', 0, DELIMITER_SAMPLE_BYTES) < 0 \
+            and mapping.find(b'\r', 0, DELIMITER_SAMPLE_BYTES) >= 0:
+        # blocks are cut at \n, so a file with bare \r line ends is left to the text stream
+        close_mapped(mapping)
+        mapping = None
+    if mapping is not None:
+        ends = []
+        blocks = iter_mapped_blocks(mapping, start, end, ends=ends)
+        if newline is None:
+            blocks = iter_universal_blocks(blocks)
+        return blocks, lambda: close_mapped(mapping), ends
+    
+    if start:
+        raise ValueError("ادامه از میانه فایل فقط برای فایل‌های محلی فشرده‌نشده ممکن است")
+    textfile = open_text_stream(path, newline=newline)
+    return iter_file_blocks(textfile), textfile.close, None
 
-def csv_to_txt(csv_path, txt_path, delimiter="|"):
-    try:
-        log(f"شروع تبدیل CSV به TXT", "INFO")
-        
-        if not os.path.exists(csv_path):
-            raise FileNotFoundError(f"فایل CSV یافت نشد: {csv_path}")
-        
-        with open(csv_path, 'r', encoding='utf-8') as csvfile:
-            lines = csvfile.readlines()
-        
-        with open(txt_path, 'w', encoding='utf-8') as txtfile:
-            for line in lines:
-                if delimiter != ',':
-                    line = line.replace(',', delimiter)
-                txtfile.write(line)
-        
-        log(f"{len(lines)} ردیف به فایل TXT نوشته شد", "STATS")
-        log(f"فایل TXT با موفقیت ایجاد شد: {txt_path}", "SUCCESS")
-        return True
-        
-    except Exception as e:
-        log(f"خطا در تبدیل CSV به TXT: {str(e)}", "ERROR")
-        return False
+def iter_block_lines(blocks):
+    for block in blocks:
+        yield from block.split('\n')
 
-def json_to_csv(json_path, csv_path):
-    try:
-        log(f"شروع تبدیل JSON به CSV", "INFO")
-        
-        if not os.path.exists(json_path):
-            raise FileNotFoundError(f"فایل JSON یافت نشد: {json_path}")
-        
-        with open(json_path, 'r', encoding='utf-8') as jsonfile:
-            data = json.load(jsonfile)
-        
-        if not data:
-            raise ValueError("فایل JSON خالی است")
-        
-        headers = list(data[0].keys())
-        
-        with open(csv_path, 'w', encoding='utf-8', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=headers)
-            writer.writeheader()
-            for row in data:
-                writer.writerow(row)
-        
-        log(f"{len(data)} ردیف به CSV تبدیل شد", "STATS")
-        log(f"فایل CSV با موفقیت ایجاد شد: {csv_path}", "SUCCESS")
-        return True
-        
-    except Exception as e:
-        log(f"خطا در تبدیل JSON به CSV: {str(e)}", "ERROR")
-        return False
+def iter_csv_row_groups(blocks, delimiter):
+    # every group ends on a record boundary that is also the end of the last block read
+    csv.field_size_limit(CSV_FIELD_SIZE_LIMIT)
+    blocks = iter(blocks)
+    pending = deque()
+    
+    def feed_reader():
+        while True:
+            if not pending:
+                block = next(blocks, '')
+                if not block:
+                    return
+                pending.extend(io.StringIO(block, newline=''))
+            yield pending.popleft()
+    
+    reader = csv.reader(feed_reader(), delimiter=delimiter)
+    
+    while True:
+        block = next(blocks, '')
+        if not block:
+            return
+        
+        # blocks without quotes or bare CRs split exactly like RFC 4180 would parse them;
+        # the C reader only runs on blocks that need it and may pull extra lines for
+        # records that continue past the block
+        if '"' not in block and '\r' not in block:
+            if block.endswith('\n'):
+                block = block[:-1]
+            yield [line.split(delimiter) if line else [] for line in block.split('\n')]
+            continue
+        
+        pending.extend(io.StringIO(block, newline=''))
+        rows = []
+        for row in reader:
+            rows.append(row)
+            if not pending:
+                break
+        yield rows
 
-def json_to_sqlite(json_path, db_path, table_name="data"):
-    try:
-        log(f"شروع تبدیل JSON به SQLite", "INFO")
-        
-        if not os.path.exists(json_path):
-            raise FileNotFoundError(f"فایل JSON یافت نشد: {json_path}")
-        
-        with open(json_path, 'r', encoding='utf-8') as jsonfile:
-            data = json.load(jsonfile)
-        
-        if not data:
-            raise ValueError("فایل JSON خالی است")
-        
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        headers = list(data[0].keys())
-        
-        create_table_sql = f"""
-        CREATE TABLE IF NOT EXISTS {table_name} (
-            {', '.join([f'"{col}" TEXT' for col in headers])}
-        )
-        """
-        cursor.execute(create_table_sql)
-        
-        insert_sql = f"""
-        INSERT INTO {table_name} ({', '.join([f'"{col}"' for col in headers])})
-        VALUES ({', '.join(['?' for _ in headers])})
-        """
-        
-        row_count = 0
-        batch_size = 1000
-        batch_data = []
-        
-        for row in data:
-            values = [row.get(col, "") for col in headers]
-            batch_data.append(values)
-            
-            if len(batch_data) >= batch_size:
-                cursor.executemany(insert_sql, batch_data)
-                row_count += len(batch_data)
-                batch_data = []
-                
-                if row_count % 10000 == 0:
-                    log(f"تاکنون {row_count} ردیف ذخیره شد", "STATS")
-        
-        if batch_data:
-            cursor.executemany(insert_sql, batch_data)
-            row_count += len(batch_data)
-        
-        conn.commit()
-        conn.close()
+def iter_csv_rows(blocks, delimiter):
+    return chain.from_iterable(iter_csv_row_groups(blocks, delimiter))
+
+def fit_row_widths(batch, column_count):
+    if batch and min(map(len, batch)) == column_count and max(map(len, batch)) == column_count:
+        return batch
+    return [values if len(values) == column_count else
+            (values + [''] * (column_count - len(values)))[:column_count]
+            for values in batch if values]
+
+def iter_csv_batches(rows, column_count, batch_size=1000):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
         
-        log(f"{row_count} ردیف در دیتابیس ذخیره شد", "STATS")
-        log(f"دیتابیس SQLite با موفقیت ایجاد شد: {db_path}", "SUCCESS")
-        return True
+        batch = fit_row_widths(batch, column_count)
+        if batch:
+            yield batch
+
+def iter_offset_batches(groups, ends, offsets, make_batch):
+    # one batch per block group; offsets records (rows so far, byte offset after them)
+    row_count = 0
+    for group in groups:
+        batch = make_batch(group)
+        row_count += len(batch)
+        offsets.append((row_count, ends[-1]))
+        if batch:
+            yield batch
+
+def skip_rows(batches, count):
+    for batch in batches:
+        if count >= len(batch):
+            count -= len(batch)
+            continue
+        if count:
+            batch = batch[count:]
+            count = 0
+        yield batch
+
+def iter_batches(iterable, batch_size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+JSON_NUMBER_CHARS = frozenset('0123456789+-.eE')
+
+def iter_json_array(jsonfile, chunk_size=STREAM_BUFFER_SIZE):
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    started = False
+    expect_value = True
+    after_comma = False
+    
+    while True:
+        pos = JSON_WHITESPACE.match(buffer, pos).end()
+        
+        if pos >= len(buffer):
+            if eof:
+                raise ValueError("آرایه JSON ناقص است")
+            chunk = jsonfile.read(chunk_size)
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            eof = not chunk
+            continue
+        
+        char = buffer[pos]
+        
+        if not started:
+            if char != '[':
+                raise ValueError("فایل JSON با آرایه شروع نمی‌شود")
+            started = True
+            pos += 1
+            continue
+        
+        if char == ']' and not after_comma:
+            # like json.load, nothing but whitespace may follow the closing bracket
+            rest = buffer[pos + 1:]
+            while True:
+                if JSON_WHITESPACE.match(rest).end() < len(rest):
+                    raise ValueError("داده اضافه پس از پایان آرایه JSON")
+                if eof:
+                    return
+                rest = jsonfile.read(chunk_size)
+                eof = not rest
+        
+        if not expect_value:
+            if char != ',':
+                raise ValueError(f"کاراکتر نامعتبر در آرایه JSON: '{char}'")
+            expect_value = True
+            after_comma = True
+            pos += 1
+            continue
         
-    except Exception as e:
-        log(f"خطا در تبدیل JSON به SQLite: {str(e)}", "ERROR")
-        return False
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            end = None
+        
+        # a number touching the end of the buffer may be cut short ("12" of "12.5")
+        if end is not None and not eof and (end == len(buffer) or buffer[end] in JSON_NUMBER_CHARS):
+            end = None
+        
+        if end is None:
+            chunk = jsonfile.read(chunk_size)
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            eof = not chunk
+            continue
+        
+        yield value
+        pos = end
+        expect_value = False
+        after_comma = False
+
+def iter_ndjson(jsonfile):
+    for line_number, line in enumerate(jsonfile, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"خطا در خط {line_number} فایل NDJSON: {str(e)}")
+
+def is_ndjson_path(path):
+    return split_compression_ext(path)[0].lower().endswith(('.ndjson', '.jsonl'))
+
+def iter_json_records(jsonfile, ndjson):
+    if ndjson:
+        yield from iter_ndjson(jsonfile)
+    else:
+        yield from iter_json_array(jsonfile)
+
+def detect_ndjson(json_path, ndjson=None):
+    if ndjson is None and is_ndjson_path(json_path):
+        ndjson = True
+    
+    if ndjson is None:
+        # sniffed on a separate handle since compressed streams cannot seek back
+        with open_text_stream(json_path) as probe:
+            first_char = ""
+            while not first_char:
+                chunk = probe.read(1)
+                if not chunk:
+                    break
+                first_char = chunk.strip()
+        ndjson = first_char not in ('[', '')
+    
+    return ndjson
 
-def json_to_sql(json_path, sql_path, table_name="data"):
+def open_json_records(json_path, ndjson=None):
+    ndjson = detect_ndjson(json_path, ndjson)
+    jsonfile = open_text_stream(json_path)
+    records = iter_json_records(jsonfile, ndjson)
     try:
-        log(f"شروع تبدیل JSON به SQL", "INFO")
-        
-        if not os.path.exists(json_path):
-            raise FileNotFoundError(f"فایل JSON یافت نشد: {json_path}")
-        
-        with open(json_path, 'r', encoding='utf-8') as jsonfile:
-            data = json.load(jsonfile)
-        
-        if not data:
-            raise ValueError("فایل JSON خالی است")
-        
-        headers = list(data[0].keys())
-        
-        with open(sql_path, 'w', encoding='utf-8') as sqlfile:
-            sqlfile.write(f"-- ایجاد جدول {table_name}\n")
-            sqlfile.write(f"CREATE TABLE {table_name} (\n")
-            
-            columns = []
-            for header in headers:
-                columns.append(f"    {header} VARCHAR(255)")
-            
-            sqlfile.write(",\n".join(columns))
-            sqlfile.write("\n);\n\n")
-            
-            sqlfile.write(f"-- درج داده‌ها در جدول {table_name}\n")
+        first_record = next(records)
+    except StopIteration:
+        jsonfile.close()
+        raise ValueError("فایل JSON خالی است")
+    except Exception:
+        jsonfile.close()
+        raise
+    
+    if not isinstance(first_record, dict):
+        jsonfile.close()
+        raise ValueError("رکوردهای JSON باید شیء (object) باشند")
+    
+    return jsonfile, first_record, chain([first_record], records)
+
+def json_record_encoder(ndjson=False, indent=None):
+    if ndjson or not indent:
+        return json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    return json.JSONEncoder(ensure_ascii=False, indent=indent).encode
+
+def write_json_records(jsonfile, records, ndjson=False, indent=None, progress=None):
+    encode = json_record_encoder(ndjson, indent)
+    return write_json_lines(jsonfile, map(encode, records), ndjson, progress)
+
+def write_json_lines(jsonfile, texts, ndjson=False, progress=None):
+    separator = "\n" if ndjson else ",\n"
+    parts = [] if ndjson else ["[\n"]
+    pending = 0
+    row_count = 0
+    if progress is not None:
+        # the encoded size is kept as each record is added, ahead of the buffered writes reaching the disk
+        progress["bytes"] += len(parts[0]) if parts else 0
+    
+    for text in texts:
+        if row_count:
+            parts.append(separator)
+        parts.append(text)
+        pending += len(text)
+        row_count += 1
+        if progress is not None:
+            progress["bytes"] += len(separator) + (len(text) if text.isascii() else len(text.encode('utf-8')))
+        
+        if pending >= STREAM_BUFFER_SIZE:
+            jsonfile.write("".join(parts))
+            parts = []
+            pending = 0
+    
+    if ndjson:
+        if row_count:
+            parts.append("\n")
+    else:
+        parts.append("\n]\n" if row_count else "]\n")
+    jsonfile.write("".join(parts))
+    
+    return row_count
+
+INTEGER_VALUE = re.compile(r'[-+]?(?:0|[1-9]\d{0,17})\Z')
+REAL_VALUE = re.compile(r'[-+]?(?:0|[1-9]\d*)?(?:\.\d+)?(?:[eE][-+]?\d+)?\Z')
+DATE_VALUE = re.compile(r'\d{4}-\d{2}-\d{2}\Z')
+DATETIME_VALUE = re.compile(r'\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[-+]\d{2}:?\d{2})?\Z')
+
+SQL_COLUMN_TYPES = {
+    "INTEGER": "INTEGER",
+    "REAL": "REAL",
+    "DATE": "DATE",
+    "DATETIME": "TIMESTAMP",
+    "TEXT": "TEXT",
+}
+
+def infer_value_type(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        return "TEXT"
+    if isinstance(value, int):
+        return "INTEGER"
+    if isinstance(value, float):
+        return "REAL"
+    if not isinstance(value, str):
+        return "TEXT"
+    
+    if INTEGER_VALUE.match(value):
+        return "INTEGER"
+    if is_real_text(value):
+        return "REAL"
+    if DATE_VALUE.match(value):
+        return "DATE"
+    if DATETIME_VALUE.match(value):
+        return "DATETIME"
+    return "TEXT"
+
+def merge_column_type(current, found):
+    if current is None or current == found:
+        return found
+    if {current, found} == {"INTEGER", "REAL"}:
+        return "REAL"
+    if {current, found} == {"DATE", "DATETIME"}:
+        return "DATETIME"
+    return "TEXT"
+
+def infer_column_types(rows, column_count):
+    column_types = [None] * column_count
+    for row in rows:
+        for i, value in enumerate(row[:column_count]):
+            if column_types[i] == "TEXT":
+                continue
+            found = infer_value_type(value)
+            if found is not None:
+                column_types[i] = merge_column_type(column_types[i], found)
+    return [column_type or "TEXT" for column_type in column_types]
+
+def is_real_text(value):
+    return value[-1:].isdigit() and REAL_VALUE.match(value) is not None
+
+def to_integer(value):
+    # only text the sample would have called INTEGER is converted; anything else is kept as it is
+    if value is None or value == '':
+        return None
+    if type(value) is str and INTEGER_VALUE.match(value):
+        return int(value)
+    return value
+
+def to_real(value):
+    if value is None or value == '':
+        return None
+    if type(value) is int:
+        return float(value)
+    if type(value) is str and (INTEGER_VALUE.match(value) or is_real_text(value)):
+        return float(value)
+    return value
+
+def to_optional(value):
+    return None if value == '' else value
+
+TYPE_CONVERTERS = {
+    "INTEGER": to_integer,
+    "REAL": to_real,
+    "DATE": to_optional,
+    "DATETIME": to_optional,
+}
+
+def convert_row_batch(batch, converters):
+    for row in batch:
+        for i, convert in converters:
+            row[i] = convert(row[i])
+    return batch
+
+def prepare_typed_batches(row_batches, column_count, infer_types=True, sample_size=TYPE_SAMPLE_SIZE):
+    if not infer_types:
+        return ["TEXT"] * column_count, row_batches
+    
+    sampled = []
+    sampled_rows = 0
+    for batch in row_batches:
+        sampled.append(batch)
+        sampled_rows += len(batch)
+        if sampled_rows >= sample_size:
+            break
+    
+    sample = islice((row for batch in sampled for row in batch), sample_size)
+    column_types = infer_column_types(sample, column_count)
+    
+    # values that disagree with the sample are kept as-is instead of failing the load
+    converters = [(i, TYPE_CONVERTERS[column_type]) for i, column_type in enumerate(column_types)
+                  if column_type in TYPE_CONVERTERS]
+    batches = chain(sampled, row_batches)
+    if converters:
+        batches = (convert_row_batch(batch, converters) for batch in batches)
+    
+    return column_types, batches
+
+def find_data_offset(path):
+    with open(path, 'rb') as f:
+        while True:
+            line = f.readline()
+            if not line or line.strip():
+                return f.tell()
+
+def split_file_ranges(path, start, chunk_size=PARALLEL_CHUNK_SIZE, quote_aware=False):
+    size = os.path.getsize(path)
+    ranges = []
+    
+    with open(path, 'rb') as f:
+        range_start = start
+        while range_start < size:
+            target = range_start + chunk_size
+            if target >= size:
+                ranges.append((range_start, size))
+                break
             
-            batch_size = 500
-            for i in range(0, len(data), batch_size):
-                batch = data[i:i+batch_size]
-                
-                sqlfile.write(f"INSERT INTO {table_name} ({', '.join(headers)}) VALUES\n")
-                
-                values_list = []
-                for row in batch:
-                    escaped_values = []
-                    for header in headers:
-                        value = row.get(header, "")
-                        if not value or value == 'NULL':
-                            escaped_values.append("NULL")
-                        else:
-                            escaped = str(value).replace("'", "''")
-                            escaped_values.append(f"'{escaped}'")
-                    
-                    values_list.append(f"    ({', '.join(escaped_values)})")
+            # ranges start on a record boundary, so an odd quote count means we are inside a field
+            parity = 0
+            if quote_aware:
+                f.seek(range_start)
+                parity = f.read(target - range_start).count(b'"') & 1
+            
+            f.seek(target)
+            block_start = target
+            end = None
+            while end is None:
+                block = f.read(1 << 16)
+                if not block:
+                    end = size
+                    break
                 
-                sqlfile.write(",\n".join(values_list))
-                sqlfile.write(";\n\n")
-        
-        log(f"فایل SQL با موفقیت ایجاد شد: {sql_path}", "SUCCESS")
-        log(f"  • تعداد INSERT statement: {(len(data) + batch_size - 1) // batch_size}", "STATS")
-        return True
-        
-    except Exception as e:
-        log(f"خطا در تبدیل JSON به SQL: {str(e)}", "ERROR")
-        return False
+                pos = 0
+                while True:
+                    newline = block.find(b'\n', pos)
+                    if newline < 0:
+                        if quote_aware:
+                            parity ^= block.count(b'"', pos) & 1
+                        break
+                    if quote_aware:
+                        parity ^= block.count(b'"', pos, newline) & 1
+                    if not parity:
+                        end = block_start + newline + 1
+                        break
+                    pos = newline + 1
+                block_start += len(block)
+            
+            ranges.append((range_start, end))
+            range_start = end
+    
+    return ranges
 
-def json_to_txt(json_path, txt_path, delimiter="|"):
+def parse_delimited_range(path, start, end, delimiter, column_count, strict, column_types, csv_format=False):
+    mapping = open_mapped(path)
     try:
-        log(f"شروع تبدیل JSON به TXT", "INFO")
-        
-        if not os.path.exists(json_path):
-            raise FileNotFoundError(f"فایل JSON یافت نشد: {json_path}")
-        
-        with open(json_path, 'r', encoding='utf-8') as jsonfile:
-            data = json.load(jsonfile)
-        
-        if not data:
-            raise ValueError("فایل JSON خالی است")
-        
-        headers = list(data[0].keys())
-        
-        with open(txt_path, 'w', encoding='utf-8') as txtfile:
-            txtfile.write(delimiter.join(headers) + "\n")
-            
-            for row in data:
-                values = [str(row.get(col, "")) for col in headers]
-                txtfile.write(delimiter.join(values) + "\n")
-        
-        log(f"{len(data)} ردیف به فایل TXT نوشته شد", "STATS")
-        log(f"فایل TXT با موفقیت ایجاد شد: {txt_path}", "SUCCESS")
-        return True
-        
-    except Exception as e:
-        log(f"خطا در تبدیل JSON به TXT: {str(e)}", "ERROR")
-        return False
+        blocks = iter_mapped_blocks(mapping, start, end)
+        if csv_format:
+            batches = iter_csv_batches(iter_csv_rows(blocks, delimiter), column_count)
+        else:
+            batches = iter_delimited_batches(iter_block_lines(blocks), delimiter, column_count, strict=strict)
+        rows = [row for batch in batches for row in batch]
+    finally:
+        close_mapped(mapping)
+    
+    converters = [(i, TYPE_CONVERTERS[column_type]) for i, column_type in enumerate(column_types)
+                  if column_type in TYPE_CONVERTERS]
+    if converters:
+        convert_row_batch(rows, converters)
+    return rows
+
+def iter_parallel_rows(path, ranges, delimiter, column_count, strict, column_types, workers, csv_format=False):
+    pending = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            for start, end in ranges:
+                pending.append(pool.submit(parse_delimited_range, path, start, end, delimiter,
+                                           column_count, strict, column_types, csv_format))
+                # keep a bounded number of parsed ranges in flight, in input order
+                if len(pending) >= workers * 2:
+                    yield from pending.pop(0).result()
+            
+            while pending:
+                yield from pending.pop(0).result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+def prepare_parallel_batches(path, delimiter, column_count, batch_size=1000, strict=False,
+                             infer_types=True, sample_size=TYPE_SAMPLE_SIZE, workers=2, csv_format=False):
+    column_types = ["TEXT"] * column_count
+    if infer_types:
+        blocks, close, _ = open_text_blocks(path, newline='' if csv_format else None)
+        try:
+            if csv_format:
+                rows = iter_csv_rows(blocks, delimiter)
+                next(rows, None)
+                batches = iter_csv_batches(rows, column_count, batch_size)
+            else:
+                lines = iter_block_lines(blocks)
+                for line in lines:
+                    if line.strip():
+                        break
+                batches = iter_delimited_batches(lines, delimiter, column_count, batch_size, strict)
+            column_types = infer_column_types(islice(chain.from_iterable(batches), sample_size), column_count)
+        finally:
+            close()
+    
+    ranges = split_file_ranges(path, find_data_offset(path), quote_aware=csv_format)
+    log(f"پردازش موازی: {len(ranges)} بخش با {workers} پردازه", "INFO")
+    
+    rows = iter_parallel_rows(path, ranges, delimiter, column_count, strict, column_types, workers, csv_format)
+    return column_types, iter_batches(rows, batch_size)
 
-def sqlite_to_csv(db_path, csv_path, table_name=None):
+COLUMN_ARRAY_CODES = {"INTEGER": "q", "REAL": "d"}
+
+def pack_column(values, column_type=None):
+    code = COLUMN_ARRAY_CODES.get(column_type)
+    if code:
+        try:
+            column = array(code, values)
+        except (TypeError, OverflowError):
+            pass
+        else:
+            if numpy is not None:
+                column = numpy.frombuffer(column, dtype=code)
+            return column, code
+    
+    # text columns share one object per distinct value; anything mixed stays a plain list
     try:
-        log(f"شروع تبدیل SQLite به CSV", "INFO")
-        
-        if not os.path.exists(db_path):
-            raise FileNotFoundError(f"فایل دیتابیس یافت نشد: {db_path}")
-        
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        if not table_name:
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [t[0] for t in cursor.fetchall()]
-            
-            if not tables:
-                raise ValueError("هیچ جدولی در دیتابیس یافت نشد")
-            
-            table_name = select_from_list(tables, "جدول")
-            if not table_name:
-                return False
-        
-        cursor.execute(f"SELECT * FROM {table_name}")
-        data = cursor.fetchall()
-        
+        return list(map(sys.intern, values)), "text"
+    except TypeError:
+        return list(values), "any"
+
+def make_column_batch(rows, column_types=None):
+    columns = []
+    kinds = []
+    for i, values in enumerate(zip(*rows)):
+        column, kind = pack_column(values, column_types[i] if column_types else None)
+        columns.append(column)
+        kinds.append(kind)
+    return {"size": len(rows), "columns": columns, "kinds": kinds}
+
+def make_row_batch(rows):
+    return {"size": len(rows), "rows": rows}
+
+def column_values(batch, i):
+    column = batch["columns"][i]
+    if batch["kinds"][i] in COLUMN_ARRAY_CODES.values():
+        return column.tolist()
+    return column
+
+def iter_column_rows(batch):
+    if "rows" in batch:
+        return map(tuple, batch["rows"])
+    if not batch["columns"]:
+        return iter([()] * batch["size"])
+    return zip(*[column_values(batch, i) for i in range(len(batch["columns"]))])
+
+def format_number_column(batch, i):
+    kind = batch["kinds"][i]
+    if kind == "q":
+        return list(map(str, batch["columns"][i].tolist()))
+    if kind == "d":
+        values = batch["columns"][i].tolist()
+        if all(map(math.isfinite, values)):
+            return list(map(repr, values))
+    return None
+
+def escape_sql_string(value):
+    return value.replace("'", "''")
+
+def escape_mysql_string(value):
+    return value.replace("\\", "\\\\").replace("'", "''").replace("\0", "\\0")
+
+def escape_copy_text(value):
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+SQL_DIALECTS = {
+    "sqlite": {
+        "quote": '"',
+        "escape": escape_sql_string,
+        "types": SQL_COLUMN_TYPES,
+        # SQLite reads an overflowing literal as infinity and stores NaN as NULL
+        "non_finite": {"inf": "9e999", "-inf": "-9e999", "nan": "NULL"},
+    },
+    "postgresql": {
+        "quote": '"',
+        "escape": escape_sql_string,
+        "types": {"INTEGER": "BIGINT", "REAL": "DOUBLE PRECISION", "DATE": "DATE", "DATETIME": "TIMESTAMP", "TEXT": "TEXT"},
+        "non_finite": {"inf": "'Infinity'", "-inf": "'-Infinity'", "nan": "'NaN'"},
+    },
+    "mysql": {
+        "quote": '`',
+        "escape": escape_mysql_string,
+        "types": {"INTEGER": "BIGINT", "REAL": "DOUBLE", "DATE": "DATE", "DATETIME": "DATETIME", "TEXT": "LONGTEXT"},
+        "non_finite": {},
+    },
+}
+
+def quote_sql_identifier(name, dialect="sqlite"):
+    quote = SQL_DIALECTS[dialect]["quote"]
+    return quote + str(name).replace(quote, quote * 2) + quote
+
+TEXT_COLUMN_SEPARATOR = "\x1f"
+
+def format_text_column(values, escape, empty_as_null, null, quote=""):
+    # the column is joined, escaped and quoted in a few whole-string calls, as long as
+    # no value contains the separator it is joined on
+    joined = TEXT_COLUMN_SEPARATOR.join(values)
+    if values and joined.count(TEXT_COLUMN_SEPARATOR) == len(values) - 1:
+        separator = quote + TEXT_COLUMN_SEPARATOR + quote
+        formatted = (quote + escape(joined).replace(TEXT_COLUMN_SEPARATOR, separator) + quote).split(TEXT_COLUMN_SEPARATOR)
+    else:
+        formatted = [quote + escape(value) + quote for value in values]
+    
+    if empty_as_null and ('' in values or 'NULL' in values):
+        formatted = [null if value == '' or value == 'NULL' else text for value, text in zip(values, formatted)]
+    return formatted
+
+def format_sql_column(batch, i, empty_as_null=True, escape=escape_sql_string, non_finite=None):
+    formatted = format_number_column(batch, i)
+    if formatted is not None:
+        return formatted
+    if batch["kinds"][i] == "text":
+        return format_text_column(batch["columns"][i], escape, empty_as_null, "NULL", "'")
+    return [format_sql_value(value, empty_as_null, escape, non_finite) for value in column_values(batch, i)]
+
+def format_sql_value(value, empty_as_null=True, escape=escape_sql_string, non_finite=None):
+    if value is None or (empty_as_null and (value == '' or value == 'NULL')):
+        return "NULL"
+    if type(value) is int:
+        return repr(value)
+    if type(value) is float:
+        if math.isfinite(value):
+            return repr(value)
+        literal = (SQL_DIALECTS["sqlite"]["non_finite"] if non_finite is None else non_finite).get(repr(value))
+        if literal is None:
+            raise ValueError(f"مقدار {value!r} در این گویش SQL قابل نوشتن نیست")
+        return literal
+    if isinstance(value, bytes):
+        return f"X'{value.hex()}'"
+    return "'" + escape(str(value)) + "'"
+
+def format_copy_column(batch, i, empty_as_null=True):
+    formatted = format_number_column(batch, i)
+    if formatted is not None:
+        return formatted
+    if batch["kinds"][i] == "text":
+        return format_text_column(batch["columns"][i], escape_copy_text, empty_as_null, "\\N")
+    return [format_copy_value(value, empty_as_null) for value in column_values(batch, i)]
+
+def format_copy_value(value, empty_as_null=True):
+    if value is None or (empty_as_null and (value == '' or value == 'NULL')):
+        return "\\N"
+    if type(value) is int:
+        return repr(value)
+    if type(value) is float:
+        return repr(value) if math.isfinite(value) else {"inf": "Infinity", "-inf": "-Infinity"}.get(repr(value), "NaN")
+    if isinstance(value, bytes):
+        return "\\\\x" + value.hex()
+    return escape_copy_text(str(value))
+
+def write_sql_inserts(sqlfile, head, row_groups, rows_per_statement=None, max_bytes=None):
+    # a statement ends at whichever comes first, the row count or the byte size; running byte
+    # totals are bisected instead of checking rows one by one
+    rows_per_statement = rows_per_statement or SQL_BATCH_SIZE
+    budget = (max_bytes or SQL_MAX_STATEMENT_BYTES) - len(head.encode('utf-8'))
+    statement_count = 0
+    pending = []
+    
+    for rows in row_groups:
+        rows = pending + rows
+        lengths = map(len, rows) if "".join(rows).isascii() else map(len, map(str.encode, rows))
+        # every row also costs the ",\n" (or ";\n") that follows it
+        totals = list(accumulate(map(add, lengths, repeat(2)), initial=0))
+        
+        start = 0
+        while start < len(rows):
+            limit = min(start + rows_per_statement, len(rows))
+            # a single row over the cap still gets a statement of its own
+            end = max(bisect_right(totals, totals[start] + budget, start + 1, limit + 1) - 1, start + 1)
+            if end == len(rows) and end - start < rows_per_statement:
+                # the next group decides whether this statement is full
+                break
+            sqlfile.write(head + ",\n".join(rows[start:end]) + ";\n\n")
+            statement_count += 1
+            start = end
+        pending = rows[start:]
+    
+    if pending:
+        sqlfile.write(head + ",\n".join(pending) + ";\n\n")
+        statement_count += 1
+    return statement_count
+
+SQLITE_BULK_PRAGMAS = [
+    ("journal_mode", "MEMORY"),
+    ("synchronous", "OFF"),
+    ("cache_size", "-262144"),
+    ("temp_store", "MEMORY"),
+    ("locking_mode", "EXCLUSIVE"),
+]
+
+def connect_sqlite_target(db_path, bulk_load=False):
+    conn = sqlite3.connect(db_path)
+    
+    if bulk_load:
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        for name, value in SQLITE_BULK_PRAGMAS:
+            if name == "journal_mode" and journal_mode.lower() == "wal":
+                continue
+            conn.execute(f"PRAGMA {name} = {value}")
+        conn.execute("BEGIN EXCLUSIVE")
+        log("حالت بارگذاری سریع SQLite فعال شد", "INFO")
+    
+    return conn
+
+def create_sqlite_indexes(cursor, table_name, indexes):
+    for index in indexes or []:
+        columns = [index] if isinstance(index, str) else list(index)
+        index_name = re.sub(r'\W', '_', f"idx_{table_name}_{'_'.join(columns)}")
+        quoted_columns = ', '.join([f'"{col}"' for col in columns])
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS "{index_name}" ON {table_name} ({quoted_columns})')
+        log(f"ایندکس '{index_name}' ساخته شد", "STATS")
+
+ROW_HASH_COLUMN = "_row_hash"
+
+def row_hash(row):
+    return hashlib.blake2b(repr(row).encode('utf-8'), digest_size=16).hexdigest()
+
+def prepare_upsert(cursor, table_name, headers, keys, content_hash):
+    if sqlite3.sqlite_version_info < (3, 24, 0):
+        raise ValueError(f"UPSERT به SQLite 3.24 یا جدیدتر نیاز دارد (نسخه فعلی: {sqlite3.sqlite_version})")
+    missing = [key for key in keys if key not in headers]
+    if missing:
+        raise ValueError(f"ستون‌های کلید در ورودی وجود ندارند: {', '.join(missing)}")
+    
+    if content_hash:
         cursor.execute(f"PRAGMA table_info({table_name})")
-        columns_info = cursor.fetchall()
-        headers = [col[1] for col in columns_info]
-        
-        with open(csv_path, 'w', encoding='utf-8', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(headers)
-            writer.writerows(data)
-        
-        conn.close()
-        
-        log(f"{len(data)} ردیف از جدول '{table_name}' به CSV تبدیل شد", "STATS")
-        log(f"فایل CSV با موفقیت ایجاد شد: {csv_path}", "SUCCESS")
-        return True
-        
-    except Exception as e:
-        log(f"خطا در تبدیل SQLite به CSV: {str(e)}", "ERROR")
-        return False
+        if ROW_HASH_COLUMN not in [col[1] for col in cursor.fetchall()]:
+            cursor.execute(f'ALTER TABLE {table_name} ADD COLUMN "{ROW_HASH_COLUMN}" TEXT')
+    
+    index_name = re.sub(r'\W', '_', f"uq_{table_name}_{'_'.join(keys)}")
+    quoted_keys = ', '.join([f'"{key}"' for key in keys])
+    cursor.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "{index_name}" ON {table_name} ({quoted_keys})')
+    
+    columns = list(headers) + ([ROW_HASH_COLUMN] if content_hash else [])
+    updates = [col for col in columns if col not in keys]
+    upsert_sql = f"""
+    INSERT INTO {table_name} ({', '.join([f'"{col}"' for col in columns])})
+    VALUES ({', '.join(['?' for _ in columns])})
+    ON CONFLICT ({quoted_keys}) """
+    if not updates:
+        return upsert_sql + "DO NOTHING"
+    
+    upsert_sql += "DO UPDATE SET " + ', '.join([f'"{col}" = excluded."{col}"' for col in updates])
+    if content_hash:
+        # rows whose hash did not move are left alone and do not count as changes
+        upsert_sql += f' WHERE {table_name}."{ROW_HASH_COLUMN}" IS NOT excluded."{ROW_HASH_COLUMN}"'
+    return upsert_sql
+
+def finish_sqlite_target(conn, table_name, indexes=None, bulk_load=False):
+    create_sqlite_indexes(conn.cursor(), table_name, indexes)
+    conn.commit()
+    
+    if bulk_load:
+        conn.execute("PRAGMA synchronous = FULL")
+        conn.execute("PRAGMA locking_mode = NORMAL")
+        if conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "memory":
+            conn.execute("PRAGMA journal_mode = DELETE")
+
+CHECKPOINT_TABLE = "_converter_checkpoints"
+CHECKPOINT_ROWS = 100000
+CHECKPOINT_TAIL_BYTES = 4096
+
+def input_identity(path):
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
 
-def sqlite_to_json(db_path, json_path, table_name=None):
+def header_fingerprint(path):
+    # the first line of an append-only file never changes; a new one means the file was replaced
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.readline(STREAM_BUFFER_SIZE)).hexdigest()
+
+def tail_fingerprint(path, offset):
+    # a file rotated under the same header still differs in the bytes just before the saved offset
+    start = max(0, offset - CHECKPOINT_TAIL_BYTES)
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+def complete_lines_end(path):
+    mapping = open_mapped(path)
+    if mapping is None:
+        return os.path.getsize(path)
     try:
-        log(f"شروع تبدیل SQLite به JSON", "INFO")
-        
-        if not os.path.exists(db_path):
-            raise FileNotFoundError(f"فایل دیتابیس یافت نشد: {db_path}")
-        
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        if not table_name:
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [t[0] for t in cursor.fetchall()]
-            
-            if not tables:
-                raise ValueError("هیچ جدولی در دیتابیس یافت نشد")
-            
-            table_name = select_from_list(tables, "جدول")
-            if not table_name:
-                return False
-        
-        cursor.execute(f"SELECT * FROM {table_name}")
-        rows = cursor.fetchall()
-        
-        data = [dict(row) for row in rows]
-        
-        with open(json_path, 'w', encoding='utf-8') as jsonfile:
-            json.dump(data, jsonfile, indent=2, ensure_ascii=False)
-        
-        conn.close()
-        
-        log(f"{len(data)} ردیف از جدول '{table_name}' به JSON تبدیل شد", "STATS")
-        log(f"فایل JSON با موفقیت ایجاد شد: {json_path}", "SUCCESS")
-        return True
-        
-    except Exception as e:
-        log(f"خطا در تبدیل SQLite به JSON: {str(e)}", "ERROR")
-        return False
+        return mapping.rfind(b'\n') + 1
+    finally:
+        close_mapped(mapping)
 
-def sqlite_to_sql(db_path, sql_path, table_name=None):
+def load_checkpoint(db_path, table_name, input_path):
+    if not os.path.exists(db_path):
+        return None
+    
+    conn = sqlite3.connect(db_path)
     try:
-        log(f"شروع تبدیل SQLite به SQL", "INFO")
-        
-        if not os.path.exists(db_path):
-            raise FileNotFoundError(f"فایل دیتابیس یافت نشد: {db_path}")
-        
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        if not table_name:
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [t[0] for t in cursor.fetchall()]
-            
-            if not tables:
-                raise ValueError("هیچ جدولی در دیتابیس یافت نشد")
-            
-            table_name = select_from_list(tables, "جدول")
-            if not table_name:
-                return False
-        
-        cursor.execute(f"SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
-        create_table_result = cursor.fetchone()
-        create_table_sql = create_table_result[0] if create_table_result else ""
-        
-        if not create_table_sql:
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns_info = cursor.fetchall()
-            columns = []
-            for col in columns_info:
-                col_name = col[1]
-                col_type = col[2]
-                columns.append(f"{col_name} {col_type}")
-            
-            create_table_sql = f"CREATE TABLE {table_name} (\n    " + ",\n    ".join(columns) + "\n)"
-        
-        cursor.execute(f"SELECT * FROM {table_name}")
-        data = cursor.fetchall()
-        
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        columns_info = cursor.fetchall()
-        headers = [col[1] for col in columns_info]
-        
-        with open(sql_path, 'w', encoding='utf-8') as sqlfile:
-            sqlfile.write(f"-- SQL dump of table '{table_name}'\n")
-            sqlfile.write(f"-- Generated by Database Converter\n\n")
-            
-            sqlfile.write(f"{create_table_sql};\n\n")
-            
-            if data:
-                sqlfile.write(f"-- داده‌های جدول '{table_name}'\n")
-                
-                batch_size = 500
-                for i in range(0, len(data), batch_size):
-                    batch = data[i:i+batch_size]
-                    
-                    sqlfile.write(f"INSERT INTO {table_name} ({', '.join(headers)}) VALUES\n")
-                    
-                    values_list = []
-                    for row in batch:
-                        escaped_values = []
-                        for value in row:
-                            if value is None:
-                                escaped_values.append("NULL")
-                            else:
-                                escaped = str(value).replace("'", "''")
-                                escaped_values.append(f"'{escaped}'")
-                        
-                        values_list.append(f"    ({', '.join(escaped_values)})")
-                    
-                    sqlfile.write(",\n".join(values_list))
-                    sqlfile.write(";\n\n")
-        
+        # tables written by older versions lack the later hash columns
+        existing = [col[1] for col in conn.execute(f"PRAGMA table_info({CHECKPOINT_TABLE})")]
+        hashes = ', '.join([column if column in existing else "NULL" for column in ("header_hash", "tail_hash")])
+        row = conn.execute(f"""
+        SELECT input_path, input_size, input_mtime, byte_offset, row_count, completed, {hashes}
+        FROM {CHECKPOINT_TABLE} WHERE table_name = ? AND input_path = ?
+        """, (table_name, os.path.abspath(input_path))).fetchone()
+    except sqlite3.OperationalError:
+        row = None
+    finally:
         conn.close()
-        
-        log(f"{len(data)} ردیف از جدول '{table_name}' به SQL تبدیل شد", "STATS")
-        log(f"فایل SQL با موفقیت ایجاد شد: {sql_path}", "SUCCESS")
-        return True
-        
-    except Exception as e:
-        log(f"خطا در تبدیل SQLite به SQL: {str(e)}", "ERROR")
-        return False
+    
+    if not row:
+        return None
+    return {"identity": tuple(row[:3]), "offset": row[3], "rows": row[4], "completed": bool(row[5]),
+            "header_hash": row[6], "tail_hash": row[7]}
 
-def sqlite_to_txt(db_path, txt_path, table_name=None, delimiter="|"):
-    try:
-        log(f"شروع تبدیل SQLite به TXT", "INFO")
-        
-        if not os.path.exists(db_path):
-            raise FileNotFoundError(f"فایل دیتابیس یافت نشد: {db_path}")
-        
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+def save_checkpoint(cursor, table_name, checkpoint, offset, row_count, completed=False):
+    tail_hash = None
+    if checkpoint["header_hash"] is not None and offset:
+        tail_hash = tail_fingerprint(checkpoint["identity"][0], offset)
+    cursor.execute(f"""
+    INSERT OR REPLACE INTO {CHECKPOINT_TABLE}
+        (table_name, input_path, input_size, input_mtime, header_hash, tail_hash, byte_offset, row_count, completed,
+         updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (table_name, *checkpoint["identity"], checkpoint["header_hash"], tail_hash, offset, row_count, int(completed),
+          datetime.now().isoformat(timespec='seconds')))
+
+def prepare_checkpoints(cursor, table_name, enabled):
+    if enabled:
+        cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} (
+            table_name TEXT,
+            input_path TEXT,
+            input_size INTEGER,
+            input_mtime INTEGER,
+            header_hash TEXT,
+            tail_hash TEXT,
+            byte_offset INTEGER,
+            row_count INTEGER,
+            completed INTEGER,
+            updated_at TEXT,
+            PRIMARY KEY (table_name, input_path)
+        )
+        """)
+        cursor.execute(f"PRAGMA table_info({CHECKPOINT_TABLE})")
+        existing = [col[1] for col in cursor.fetchall()]
+        for column in ("header_hash", "tail_hash"):
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE {CHECKPOINT_TABLE} ADD COLUMN {column} TEXT")
+        return
+    
+    # a plain reload makes any earlier checkpoint for this table meaningless
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (CHECKPOINT_TABLE,))
+    if cursor.fetchone():
+        cursor.execute(f"DELETE FROM {CHECKPOINT_TABLE} WHERE table_name = ?", (table_name,))
+
+def plan_checkpoint(input_format, input_path, db_path, read_options, write_options):
+    table_name = write_options.get("table_name") or "data"
+    identity = input_identity(input_path)
+    saved = load_checkpoint(db_path, table_name, input_path)
+    read_options["track_offsets"] = True
+    
+    if write_options.get("incremental"):
+        if detect_compression(input_path) or (input_format == "json" and not detect_ndjson(input_path, read_options.get("ndjson"))):
+            raise ValueError("حالت افزایشی فقط برای فایل‌های CSV، TXT و NDJSON محلی و فشرده‌نشده ممکن است")
+        
+        header_hash = header_fingerprint(input_path)
+        end = complete_lines_end(input_path)
+        start = 0
+        base_rows = 0
+        if (saved and saved["header_hash"] == header_hash and saved["offset"] is not None and saved["offset"] <= end
+                and saved["tail_hash"] in (None, tail_fingerprint(input_path, saved["offset"]))):
+            start = saved["offset"]
+            base_rows = saved["rows"]
+        elif saved:
+            log(f"فایل '{input_path}' جایگزین یا کوتاه شده است؛ دریافت از ابتدا", "WARNING")
+        
+        if start >= end:
+            log(f"داده جدیدی در '{input_path}' نیست", "INFO")
+            return None
         
-        if not table_name:
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [t[0] for t in cursor.fetchall()]
-            
-            if not tables:
-                raise ValueError("هیچ جدولی در دیتابیس یافت نشد")
-            
-            if len(tables) == 1:
-                table_name = tables[0]
+        if start:
+            log(f"دریافت افزایشی از بایت {start} تا {end}", "INFO")
+        read_options.update(start_offset=start, end_offset=end, workers=None)
+        return {"identity": identity, "header_hash": header_hash, "base_rows": base_rows, "end": end}
+    
+    if saved and saved["identity"] != identity:
+        raise ValueError("فایل ورودی پس از آخرین checkpoint تغییر کرده است")
+    if saved and saved["completed"]:
+        log(f"بارگذاری جدول '{table_name}' قبلاً کامل شده است ({saved['rows']} ردیف)", "SUCCESS")
+        return None
+    
+    if saved and saved["offset"] is not None:
+        read_options["start_offset"] = saved["offset"]
+        log(f"ادامه از بایت {saved['offset']} پس از {saved['rows']} ردیف ذخیره‌شده", "INFO")
+    return {"identity": identity, "header_hash": None, "base_rows": saved["rows"] if saved else 0, "end": None}
+
+def pop_batch_offset(offsets, row_count):
+    offset = None
+    while offsets and offsets[0][0] <= row_count:
+        rows, end = offsets.popleft()
+        offset = end if rows == row_count else None
+    return offset
+
+def iter_cursor_batches(cursor, fetch_size=SQLITE_FETCH_SIZE):
+    cursor.arraysize = fetch_size
+    while True:
+        rows = cursor.fetchmany()
+        if not rows:
+            return
+        yield rows
+
+SQL_GAP = r"(?:\s+|--[^\n]*|/\*.*?\*/)*"
+# standard SQL strings only double their quotes; MySQL also escapes with backslashes
+SQL_STRING = r"'[^']*(?:''[^']*)*'"
+SQL_BACKSLASH_STRING = r"'[^'\\]*(?:(?:''|\\.)[^'\\]*)*'"
+
+def sql_bytes_pattern(regex):
+    # identifiers may be non-ASCII, which bytes-mode \w would not match
+    pattern = regex.pattern.replace(r"[\w.]", r"[\w.\x80-\xff]").replace(r"\w+", r"[\w\x80-\xff]+")
+    return re.compile(pattern.encode('ascii'), regex.flags & ~re.UNICODE)
+
+def compile_sql_tokens(string):
+    value = re.compile(SQL_GAP + r"""(?:
+          (?P<string>""" + string + r""")
+        | (?P<blob>[xX]'[0-9A-Fa-f]*')
+        | (?P<number>[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)
+        | (?P<word>[A-Za-z_][\w.]*(?:\([^()']*\))?)
+        | (?P<punct>[(),;])
+    )""", re.VERBOSE | re.DOTALL)
+    
+    statement = re.compile(r"""
+          (?P<comment>--[^\n]*\n|/\*.*?\*/)
+        | (?P<string>""" + string + r""")
+        | (?P<create>\bCREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?["`\[]?(?P<create_table>\w+)["`\]]?\s*\()
+        | (?P<insert>\bINSERT\s+(?:OR\s+\w+\s+|IGNORE\s+)?INTO\s+["`\[]?(?P<insert_table>\w+)["`\]]?\s*
+            (?:\((?P<insert_columns>[^()]*)\)\s*)?VALUES)
+        | (?P<partial>--|/\*|')
+    """, re.VERBOSE | re.DOTALL | re.IGNORECASE)
+    
+    definition = re.compile(r"""
+          (?:--[^\n]*|/\*.*?\*/)
+        | """ + string + r"""
+        | "[^"]*"
+        | [(),]
+        | [^(),'"\s\-/]+
+        | .
+    """, re.VERBOSE | re.DOTALL)
+    
+    return {"value": value, "statement": statement, "definition": definition,
+            "value_bytes": sql_bytes_pattern(value), "statement_bytes": sql_bytes_pattern(statement),
+            "definition_bytes": sql_bytes_pattern(definition)}
+
+SQL_TOKENS = compile_sql_tokens(SQL_STRING)
+SQL_BACKSLASH_TOKENS = compile_sql_tokens(SQL_BACKSLASH_STRING)
+SQL_VALUE_TOKEN = SQL_TOKENS["value"]
+SQL_DEFINITION_TOKEN = SQL_TOKENS["definition"]
+
+SQL_ESCAPE = re.compile(r"''|\\(.)", re.DOTALL)
+MYSQL_ESCAPES = {"0": "\0", "b": "\b", "n": "\n", "r": "\r", "t": "\t", "Z": "\x1a", "%": "\\%", "_": "\\_"}
+MYSQL_DUMP_MARKERS = re.compile(r"-- MySQL dump|/\*!\d{5}|\b(?:CREATE\s+TABLE(?:\s+IF\s+NOT\s+EXISTS)?|INSERT\s+(?:IGNORE\s+)?INTO)\s+`",
+                                re.IGNORECASE)
+SQL_CONSTRAINT_KEYWORDS = {'PRIMARY', 'UNIQUE', 'FOREIGN', 'CONSTRAINT', 'CHECK', 'KEY', 'INDEX'}
+
+def decode_sql_string(token, backslash_escapes=False):
+    value = token[1:-1]
+    if backslash_escapes and "\\" in value:
+        return SQL_ESCAPE.sub(lambda m: MYSQL_ESCAPES.get(m.group(1), m.group(1)) if m.group(1) else "'", value)
+    if "''" in value:
+        value = value.replace("''", "'")
+    return value
+
+def detect_backslash_escapes(sql_path):
+    # a MySQL dump gives itself away in its header comment or its backtick-quoted names
+    with open_text_stream(sql_path) as sqlfile:
+        return MYSQL_DUMP_MARKERS.search(sqlfile.read(DELIMITER_SAMPLE_BYTES)) is not None
+
+def parse_sql_values(text, pos=0, value_token=SQL_VALUE_TOKEN, decode=None, backslash_escapes=False):
+    match_token = value_token.match
+    if decode:
+        open_paren, close_paren, comma, semicolon = b'(', b')', b',', b';'
+    else:
+        open_paren, close_paren, comma, semicolon = '(', ')', ',', ';'
+    rows = []
+    
+    while True:
+        match = match_token(text, pos)
+        if not match or match.group('punct') != open_paren:
+            raise ValueError(f"انتظار '(' در موقعیت {pos} فایل SQL")
+        pos = match.end()
+        
+        row = []
+        expect_value = True
+        while True:
+            match = match_token(text, pos)
+            if not match:
+                raise ValueError(f"مقدار نامعتبر در موقعیت {pos} فایل SQL")
+            pos = match.end()
+            kind = match.lastgroup
+            
+            if kind == 'punct':
+                punct = match.group('punct')
+                if punct == close_paren and not (expect_value and row):
+                    break
+                if punct == comma and not expect_value:
+                    expect_value = True
+                    continue
+                raise ValueError(f"کاراکتر '{decode(punct) if decode else punct}' غیرمنتظره در موقعیت {pos} فایل SQL")
+            
+            if not expect_value:
+                raise ValueError(f"جداکننده ',' در موقعیت {pos} فایل SQL یافت نشد")
+            
+            value = match.group(kind)
+            if decode:
+                value = decode(value)
+            if kind == 'string':
+                row.append(decode_sql_string(value, backslash_escapes))
+            elif kind == 'blob':
+                row.append(bytes.fromhex(value[2:-1]))
+            elif kind == 'number':
+                row.append(value)
             else:
-                table_name = select_from_list(tables, "جدول")
-                if not table_name:
-                    return False
-        
-        cursor.execute(f"SELECT * FROM {table_name}")
-        data = cursor.fetchall()
-        
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        columns_info = cursor.fetchall()
-        headers = [col[1] for col in columns_info]
-        
-        with open(txt_path, 'w', encoding='utf-8') as txtfile:
-            txtfile.write(delimiter.join(headers) + "\n")
-            
-            for row in data:
-                values = [str(item) if item is not None else "" for item in row]
-                txtfile.write(delimiter.join(values) + "\n")
-        
-        conn.close()
-        
-        log(f"{len(data)} ردیف از جدول '{table_name}' به TXT تبدیل شد", "STATS")
-        log(f"فایل TXT با موفقیت ایجاد شد: {txt_path}", "SUCCESS")
-        return True
-        
-    except Exception as e:
-        log(f"خطا در تبدیل SQLite به TXT: {str(e)}", "ERROR")
-        return False
+                row.append(None if value.upper() == 'NULL' else value)
+            expect_value = False
+        
+        rows.append(row)
+        
+        match = match_token(text, pos)
+        if not match:
+            return rows, None
+        punct = match.group('punct')
+        if punct == comma:
+            pos = match.end()
+            continue
+        if punct == semicolon:
+            return rows, match.end()
+        return rows, pos
 
-def parse_sql_file(sql_path):
-    try:
-        with open(sql_path, 'r', encoding='utf-8') as sqlfile:
-            content = sqlfile.read()
+def parse_create_table_columns(text, pos, definition_token=SQL_DEFINITION_TOKEN, decode=None):
+    columns = []
+    depth = 1
+    at_definition_start = True
+    
+    for match in definition_token.finditer(text, pos):
+        token = match.group()
+        if decode:
+            token = decode(token)
+        if token.isspace() or token.startswith('--') or token.startswith('/*'):
+            continue
+        if token in ("'", '"'):
+            raise ValueError("رشته بسته نشده در دستور CREATE TABLE")
+        
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+            if depth == 0:
+                return columns, match.end()
+        elif token == ',' and depth == 1:
+            at_definition_start = True
+        elif at_definition_start:
+            if token.upper() not in SQL_CONSTRAINT_KEYWORDS:
+                columns.append(token.strip('"\'`[]'))
+            at_definition_start = False
+    
+    raise ValueError("دستور CREATE TABLE کامل نیست")
 
-        content = re.sub(r'--.*$', '', content, flags=re.MULTILINE)
-        content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
+def iter_sql_dump(sqlfile, chunk_size=STREAM_BUFFER_SIZE, backslash_escapes=False):
+    tokens = SQL_BACKSLASH_TOKENS if backslash_escapes else SQL_TOKENS
+    buffer = ""
+    pos = 0
+    eof = False
+    
+    while True:
+        if not eof and len(buffer) - pos < chunk_size:
+            chunk = sqlfile.read(chunk_size)
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            if not chunk:
+                # a trailing newline closes a final '--' comment
+                buffer += "\n"
+                eof = True
+        
+        match = tokens["statement"].search(buffer, pos)
+        need_more = False
+        
+        if not match:
+            if eof:
+                return
+            # keep a tail so a statement head cut by the chunk boundary is rescanned
+            pos = max(pos, len(buffer) - 1024)
+            need_more = True
+        else:
+            kind = match.lastgroup
+            try:
+                if kind == 'create':
+                    columns, end = parse_create_table_columns(buffer, match.end(), tokens["definition"])
+                    yield ('create', match.group('create_table'), columns, None)
+                    pos = end
+                elif kind == 'insert':
+                    rows, end = parse_sql_values(buffer, match.end(), tokens["value"], None, backslash_escapes)
+                    if end is None and not eof:
+                        need_more = True
+                    else:
+                        columns = match.group('insert_columns')
+                        if columns is not None:
+                            columns = [col.strip().strip('"\'`[]') for col in columns.split(',')]
+                        yield ('insert', match.group('insert_table'), columns, rows)
+                        pos = len(buffer) if end is None else end
+                elif kind == 'partial' and not eof:
+                    need_more = True
+                else:
+                    pos = match.end()
+            except ValueError:
+                if eof:
+                    raise
+                need_more = True
+            
+            if need_more:
+                pos = match.start()
+        
+        if need_more:
+            # statements longer than the buffer grow it geometrically
+            chunk = sqlfile.read(max(chunk_size, len(buffer) - pos))
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            if not chunk:
+                buffer += "\n"
+                eof = True
 
-        create_table_match = re.search(r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?"?(\w+)"?\s*\((.*?)\)\s*;', content, re.IGNORECASE | re.DOTALL)
-        
-        if not create_table_match:
+def iter_mapped_sql_dump(mapping, backslash_escapes=False):
+    # the whole dump is addressable, so statements are parsed in place without refills
+    # and only the values they contain are decoded
+    tokens = SQL_BACKSLASH_TOKENS if backslash_escapes else SQL_TOKENS
+    decode = bytes.decode
+    pos = 0
+    
+    while True:
+        match = tokens["statement_bytes"].search(mapping, pos)
+        if not match:
+            return
+        
+        kind = match.lastgroup
+        if kind == 'create':
+            columns, pos = parse_create_table_columns(mapping, match.end(), tokens["definition_bytes"], decode)
+            yield ('create', decode(match.group('create_table')), columns, None)
+        elif kind == 'insert':
+            rows, end = parse_sql_values(mapping, match.end(), tokens["value_bytes"], decode, backslash_escapes)
+            columns = match.group('insert_columns')
+            if columns is not None:
+                columns = [col.strip().strip('"\'`[]') for col in decode(columns).split(',')]
+            yield ('insert', decode(match.group('insert_table')), columns, rows)
+            pos = len(mapping) if end is None else end
+        elif kind == 'partial' and match.group() != b"'":
+            # an unterminated comment runs to the end of the file
+            return
+        else:
+            pos = match.end()
+
+def iter_sql_table_rows(events, table_name, headers):
+    width = len(headers)
+    positions = {header.lower(): i for i, header in enumerate(headers)}
+    
+    for kind, event_table, columns, rows in events:
+        if kind != 'insert' or event_table.lower() != table_name.lower():
+            continue
+        
+        if columns:
+            targets = [positions.get(col.lower()) for col in columns]
+            mapped = []
+            for row in rows:
+                values = [None] * width
+                for target, value in zip(targets, row):
+                    if target is not None:
+                        values[target] = value
+                mapped.append(values)
+            rows = mapped
+        else:
+            for i, row in enumerate(rows):
+                if len(row) < width:
+                    rows[i] = row + [None] * (width - len(row))
+                elif len(row) > width:
+                    rows[i] = row[:width]
+        
+        yield rows
+
+def iter_sql_tables(events, strays=None):
+    # dumps usually put each table's INSERTs after its CREATE TABLE, so a table's rows end at the next CREATE;
+    # INSERTs found anywhere else are named in strays for the caller to pick up in a pass of their own
+    strays = set() if strays is None else strays
+    pending = []
+    
+    def table_events(table_name):
+        for event in events:
+            if event[0] == 'create':
+                pending.append(event)
+                return
+            if event[0] == 'insert' and event[1].lower() != table_name.lower():
+                strays.add(event[1].lower())
+            yield event
+    
+    for event in events:
+        if event[0] == 'insert':
+            strays.add(event[1].lower())
+        while event is not None and event[0] == 'create':
+            _, table_name, headers, _ = event
+            yield table_name, headers, iter_sql_table_rows(table_events(table_name), table_name, headers)
+            event = pending.pop() if pending else None
+
+def open_sql_events(sql_path, backslash_escapes=None):
+    if backslash_escapes is None:
+        backslash_escapes = detect_backslash_escapes(sql_path)
+    mapping = open_mapped(sql_path)
+    if mapping is not None:
+        return iter_mapped_sql_dump(mapping, backslash_escapes), lambda: close_mapped(mapping)
+    
+    sqlfile = open_text_stream(sql_path)
+    return iter_sql_dump(sqlfile, backslash_escapes=backslash_escapes), sqlfile.close
+
+def open_sql_rows(sql_path, backslash_escapes=None):
+    events, close = open_sql_events(sql_path, backslash_escapes)
+    try:
+        for kind, table_name, headers, _ in events:
+            if kind == 'create':
+                break
+        else:
             raise ValueError("دستور CREATE TABLE در فایل SQL یافت نشد")
-        
-        table_name = create_table_match.group(1)
-        columns_section = create_table_match.group(2)
-
-        columns = []
-        lines = columns_section.split('\n')
-        for line in lines:
-            line = line.strip().strip(',')
-            if line:
-                col_parts = line.split()
-                if col_parts:
-                    col_name = col_parts[0].strip('"\'')
-                    columns.append(col_name)
-
-        insert_pattern = r'INSERT\s+INTO\s+\w+\s+VALUES\s*\((.*?)\);'
-        insert_matches = re.findall(insert_pattern, content, re.IGNORECASE | re.DOTALL)
-        
-        data = []
-        for insert_match in insert_matches:
-            values = []
-            in_string = False
-            current_value = ""
-            
-            for char in insert_match:
-                if char == "'" and not (len(current_value) > 0 and current_value[-1] == '\\'):
-                    in_string = not in_string
-                    current_value += char
-                elif char == ',' and not in_string:
-                    values.append(current_value.strip())
-                    current_value = ""
-                else:
-                    current_value += char
-            
-            if current_value:
-                values.append(current_value.strip())
-            
-            cleaned_values = []
-            for value in values:
-                if value.upper() == 'NULL':
-                    cleaned_values.append(None)
-                elif value.startswith("'") and value.endswith("'"):
-                    cleaned_values.append(value[1:-1].replace("''", "'"))
-                else:
-                    cleaned_values.append(value)
-            
-            data.append(cleaned_values)
+    except Exception:
+        close()
+        raise
+    
+    return close, table_name, headers, iter_sql_table_rows(events, table_name, headers)
+
+def parse_sql_file(sql_path):
+    try:
+        close, table_name, columns, row_batches = open_sql_rows(sql_path)
+        try:
+            data = [row for rows in row_batches for row in rows]
+        finally:
+            close()
         
         return table_name, columns, data
         
     except Exception as e:
         raise ValueError(f"خطا در پارس کردن فایل SQL: {str(e)}")
 
-def sql_to_csv(sql_path, csv_path):
-    try:
-        log(f"شروع تبدیل SQL به CSV", "INFO")
-        
-        if not os.path.exists(sql_path):
-            raise FileNotFoundError(f"فایل SQL یافت نشد: {sql_path}")
-        
-        table_name, headers, data = parse_sql_file(sql_path)
-        
-        log(f"جدول '{table_name}' با {len(headers)} ستون و {len(data)} ردیف شناسایی شد", "STATS")
-        
-        with open(csv_path, 'w', encoding='utf-8', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(headers)
-            writer.writerows(data)
-        
-        log(f"{len(data)} ردیف به CSV تبدیل شد", "STATS")
-        log(f"فایل CSV با موفقیت ایجاد شد: {csv_path}", "SUCCESS")
-        return True
-        
-    except Exception as e:
-        log(f"خطا در تبدیل SQL به CSV: {str(e)}", "ERROR")
-        return False
+FORMAT_TITLES = {"csv": "CSV", "json": "JSON", "sqlite": "SQLite", "sql": "SQL", "txt": "TXT"}
+INPUT_LABELS = {"csv": "فایل CSV", "json": "فایل JSON", "sqlite": "فایل دیتابیس", "sql": "فایل SQL", "txt": "فایل TXT"}
+TYPED_OUTPUTS = {"sqlite", "sql"}
+SQL_BATCH_SIZE = 500
+SQL_MAX_STATEMENT_BYTES = 1 << 20
 
-def sql_to_json(sql_path, json_path):
-    try:
-        log(f"شروع تبدیل SQL به JSON", "INFO")
-        
-        if not os.path.exists(sql_path):
-            raise FileNotFoundError(f"فایل SQL یافت نشد: {sql_path}")
-        
-        table_name, headers, data = parse_sql_file(sql_path)
-        
-        log(f"جدول '{table_name}' با {len(headers)} ستون و {len(data)} ردیف شناسایی شد", "STATS")
-        
-        json_data = []
-        for row in data:
-            item = {}
-            for i, header in enumerate(headers):
-                if i < len(row):
-                    item[header] = row[i]
-                else:
-                    item[header] = None
-            json_data.append(item)
-        
-        with open(json_path, 'w', encoding='utf-8') as jsonfile:
-            json.dump(json_data, jsonfile, indent=2, ensure_ascii=False)
-        
-        log(f"{len(json_data)} ردیف به JSON تبدیل شد", "STATS")
-        log(f"فایل JSON با موفقیت ایجاد شد: {json_path}", "SUCCESS")
-        return True
-        
-    except Exception as e:
-        log(f"خطا در تبدیل SQL به JSON: {str(e)}", "ERROR")
-        return False
+def make_source(headers, batches, table_name=None, column_types=None, close=None, **extra):
+    source = {
+        "headers": headers,
+        "batches": batches,
+        "table_name": table_name,
+        "column_types": column_types,
+        "close": close or (lambda: None),
+        "empty_as_null": True,
+    }
+    source.update(extra)
+    return source
 
-def sql_to_sqlite(sql_path, db_path):
-    try:
-        log(f"شروع تبدیل SQL به SQLite", "INFO")
-        
-        if not os.path.exists(sql_path):
-            raise FileNotFoundError(f"فایل SQL یافت نشد: {sql_path}")
-        
-        table_name, headers, data = parse_sql_file(sql_path)
-        
-        log(f"جدول '{table_name}' با {len(headers)} ستون و {len(data)} ردیف شناسایی شد", "STATS")
-        
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        create_table_sql = f"""
-        CREATE TABLE IF NOT EXISTS {table_name} (
-            {', '.join([f'"{col}" TEXT' for col in headers])}
-        )
-        """
-        cursor.execute(create_table_sql)
-        
-        insert_sql = f"""
-        INSERT INTO {table_name} ({', '.join([f'"{col}"' for col in headers])})
-        VALUES ({', '.join(['?' for _ in headers])})
-        """
-        
-        row_count = 0
-        batch_size = 1000
-        batch_data = []
-        
-        for row in data:
-            batch_data.append(row)
-            
-            if len(batch_data) >= batch_size:
-                cursor.executemany(insert_sql, batch_data)
-                row_count += len(batch_data)
-                batch_data = []
-        
-        if batch_data:
-            cursor.executemany(insert_sql, batch_data)
-            row_count += len(batch_data)
-        
-        conn.commit()
-        conn.close()
-        
-        log(f"{row_count} ردیف در دیتابیس ذخیره شد", "STATS")
-        log(f"دیتابیس SQLite با موفقیت ایجاد شد: {db_path}", "SUCCESS")
-        return True
-        
-    except Exception as e:
-        log(f"خطا در تبدیل SQL به SQLite: {str(e)}", "ERROR")
-        return False
+CSV_DELIMITERS = [',', ';', '\t', '|', ':', '#', '~']
+TXT_DELIMITERS = ['|', ',', ';', '\t', ':', '#', '~']
+DELIMITER_SAMPLE_BYTES = 64 * 1024
+DELIMITER_SAMPLE_ROWS = 100
+DELIMITER_CACHE = {}
 
-def sql_to_txt(sql_path, txt_path, delimiter="|"):
-    try:
-        log(f"شروع تبدیل SQL به TXT", "INFO")
-        
-        if not os.path.exists(sql_path):
-            raise FileNotFoundError(f"فایل SQL یافت نشد: {sql_path}")
-        
-        table_name, headers, data = parse_sql_file(sql_path)
-        
-        log(f"جدول '{table_name}' با {len(headers)} ستون و {len(data)} ردیف شناسایی شد", "STATS")
-        
-        with open(txt_path, 'w', encoding='utf-8') as txtfile:
-            txtfile.write(delimiter.join(headers) + "\n")
-            
-            for row in data:
-                values = [str(item) if item is not None else "" for item in row]
-                txtfile.write(delimiter.join(values) + "\n")
-        
-        log(f"{len(data)} ردیف به فایل TXT نوشته شد", "STATS")
-        log(f"فایل TXT با موفقیت ایجاد شد: {txt_path}", "SUCCESS")
-        return True
-        
-    except Exception as e:
-        log(f"خطا در تبدیل SQL به TXT: {str(e)}", "ERROR")
-        return False
+def sample_rows(sample, delimiter, quoted):
+    if quoted:
+        rows = csv.reader(io.StringIO(sample, newline=''), delimiter=delimiter)
+    else:
+        rows = (line.split(delimiter) for line in (line.strip() for line in sample.splitlines()) if line)
+    return [len(row) for row in islice((row for row in rows if row), DELIMITER_SAMPLE_ROWS)]
+
+def detect_delimiter(path, candidates, quoted=True, default=None):
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, quoted)
+    if key in DELIMITER_CACHE:
+        return DELIMITER_CACHE[key]
+    
+    with open_text_stream(path, newline='') as textfile:
+        sample = textfile.read(DELIMITER_SAMPLE_BYTES)
+    if len(sample) == DELIMITER_SAMPLE_BYTES and "\n" in sample:
+        sample = sample[:sample.rindex("\n") + 1]
+    
+    # the delimiter whose field count stays closest to the header's across the sample wins;
+    # quoted fields are parsed first so embedded delimiters do not count
+    delimiter = default
+    best_score = None
+    for candidate in candidates:
+        counts = sample_rows(sample, candidate, quoted)
+        if not counts or counts[0] < 2:
+            continue
+        
+        consistency = sum(1 for count in counts if count == counts[0]) / len(counts)
+        score = (consistency, counts[0])
+        if best_score is None or score > best_score:
+            best_score = score
+            delimiter = candidate
+    
+    DELIMITER_CACHE[key] = delimiter
+    return delimiter
+
+def parallel_workers(path, options):
+    workers = options.get("workers")
+    if not workers or workers < 2:
+        return None
+    if detect_compression(path):
+        log("ورودی فشرده است؛ پردازش موازی غیرفعال شد", "WARNING")
+        return None
+    return workers
 
-def txt_to_csv(txt_path, csv_path, delimiter=None):
+def read_csv_source(csv_path, options):
+    start = options.get("start_offset") or 0
+    blocks, close, ends = open_text_blocks(csv_path, newline='', start=start, end=options.get("end_offset"))
     try:
-        log(f"شروع تبدیل TXT به CSV", "INFO")
-        
-        if not os.path.exists(txt_path):
-            raise FileNotFoundError(f"فایل TXT یافت نشد: {txt_path}")
-        
-        with open(txt_path, 'r', encoding='utf-8') as txtfile:
-            lines = [line.strip() for line in txtfile if line.strip()]
-        
-        if not lines:
-            raise ValueError("فایل TXT خالی است")
-        
-        if not delimiter:
-            delimiters = ['|', ',', ';', '\t', ':', '#', '~']
-            max_count = 0
-            
-            for delim in delimiters:
-                count = lines[0].count(delim)
-                if count > max_count:
-                    max_count = count
-                    delimiter = delim
-        
+        delimiter = detect_delimiter(csv_path, CSV_DELIMITERS, quoted=True, default=',')
         log(f"جداکننده تشخیص داده شده: '{delimiter}'", "STATS")
         
-        data = [line.split(delimiter) for line in lines]
-        
-        with open(csv_path, 'w', encoding='utf-8', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            for row in data:
-                writer.writerow(row)
-        
-        log(f"{len(data)} ردیف به CSV تبدیل شد", "STATS")
-        log(f"فایل CSV با موفقیت ایجاد شد: {csv_path}", "SUCCESS")
-        return True
-        
-    except Exception as e:
-        log(f"خطا در تبدیل TXT به CSV: {str(e)}", "ERROR")
-        return False
+        groups = iter_csv_row_groups(blocks, delimiter)
+        if start:
+            with open_text_stream(csv_path, newline='') as csvfile:
+                headers = next(iter_csv_rows(iter_file_blocks(csvfile), delimiter), None)
+        else:
+            first_group = next(groups, [])
+            headers = first_group[0] if first_group else None
+            groups = chain([first_group[1:]], groups)
+        if not headers or not "".join(headers).strip():
+            raise ValueError("فایل CSV خالی است")
+        log(f"تعداد ستون‌ها: {len(headers)}", "STATS")
+        
+        column_types = None
+        offsets = None
+        workers = parallel_workers(csv_path, options)
+        if workers and not start:
+            column_types, batches = prepare_parallel_batches(
+                csv_path, delimiter, len(headers), infer_types=options.get("infer_types", False),
+                sample_size=options.get("sample_size", TYPE_SAMPLE_SIZE), workers=workers, csv_format=True)
+        elif options.get("track_offsets") and ends is not None:
+            offsets = deque()
+            batches = iter_offset_batches(groups, ends, offsets, lambda rows: fit_row_widths(rows, len(headers)))
+        else:
+            batches = iter_csv_batches(chain.from_iterable(groups), len(headers))
+    except Exception:
+        close()
+        raise
+    
+    return make_source(headers, batches, column_types=column_types, close=close, offsets=offsets)
 
-def txt_to_json(txt_path, json_path, delimiter=None):
+def read_txt_source(txt_path, options):
+    start = options.get("start_offset") or 0
+    blocks, close, ends = open_text_blocks(txt_path, start=start, end=options.get("end_offset"))
     try:
-        log(f"شروع تبدیل TXT به JSON", "INFO")
-        
-        if not os.path.exists(txt_path):
-            raise FileNotFoundError(f"فایل TXT یافت نشد: {txt_path}")
-        
-        with open(txt_path, 'r', encoding='utf-8') as txtfile:
-            lines = [line.strip() for line in txtfile if line.strip()]
-        
-        if not lines:
+        groups = (block.split('\n') for block in blocks)
+        if start:
+            with open_text_stream(txt_path) as txtfile:
+                header_lines = iter_block_lines(iter_file_blocks(txtfile))
+                first_line = next((line.strip() for line in header_lines if line.strip()), "")
+        else:
+            first_line = ""
+            for group in groups:
+                for i, line in enumerate(group):
+                    first_line = line.strip()
+                    if first_line:
+                        break
+                if first_line:
+                    groups = chain([group[i + 1:]], groups)
+                    break
+        if not first_line:
             raise ValueError("فایل TXT خالی است")
         
-        if not delimiter:
-            delimiters = ['|', ',', ';', '\t', ':', '#', '~']
-            max_count = 0
-            
-            for delim in delimiters:
-                count = lines[0].count(delim)
-                if count > max_count:
-                    max_count = count
-                    delimiter = delim
-        
+        delimiter = options.get("delimiter") or detect_delimiter(txt_path, TXT_DELIMITERS, quoted=False)
         log(f"جداکننده تشخیص داده شده: '{delimiter}'", "STATS")
         
-        headers = lines[0].split(delimiter)
-        start_idx = 1 if len(lines) > 1 and len(lines[0].split(delimiter)) == len(lines[1].split(delimiter)) else 0
-        
-        data = []
-        for line in lines[start_idx:]:
-            values = line.split(delimiter)
-            if len(values) == len(headers):
-                row = {headers[i]: values[i] for i in range(len(headers))}
-                data.append(row)
-        
-        with open(json_path, 'w', encoding='utf-8') as jsonfile:
-            json.dump(data, jsonfile, indent=2, ensure_ascii=False)
-        
-        log(f"{len(data)} ردیف به JSON تبدیل شد", "STATS")
-        log(f"فایل JSON با موفقیت ایجاد شد: {json_path}", "SUCCESS")
-        return True
-        
-    except Exception as e:
-        log(f"خطا در تبدیل TXT به JSON: {str(e)}", "ERROR")
-        return False
+        headers = first_line.split(delimiter)
+        strict = options.get("strict", True)
+        
+        column_types = None
+        offsets = None
+        workers = parallel_workers(txt_path, options)
+        if workers and not start:
+            column_types, batches = prepare_parallel_batches(
+                txt_path, delimiter, len(headers), strict=strict, infer_types=options.get("infer_types", False),
+                sample_size=options.get("sample_size", TYPE_SAMPLE_SIZE), workers=workers)
+        elif options.get("track_offsets") and ends is not None:
+            offsets = deque()
+            make_batch = lambda lines: next(iter_delimited_batches(lines, delimiter, len(headers), len(lines) + 1, strict), [])
+            batches = iter_offset_batches(groups, ends, offsets, make_batch)
+        else:
+            batches = iter_delimited_batches(chain.from_iterable(groups), delimiter, len(headers), strict=strict)
+    except Exception:
+        close()
+        raise
+    
+    return make_source(headers, batches, column_types=column_types, close=close, offsets=offsets)
 
-def txt_to_sqlite(txt_path, db_path, table_name="data", delimiter=None):
+def parse_ndjson_block(block, end):
     try:
-        log(f"شروع تبدیل TXT به SQLite", "INFO")
-        
-        if not os.path.exists(txt_path):
-            raise FileNotFoundError(f"فایل TXT یافت نشد: {txt_path}")
-        
-        with open(txt_path, 'r', encoding='utf-8') as txtfile:
-            lines = [line.strip() for line in txtfile if line.strip()]
+        return [json.loads(line) for line in block.split('\n') if line.strip()]
+    except json.JSONDecodeError as e:
+        raise ValueError(f"خطا در فایل NDJSON پیش از بایت {end}: {str(e)}")
+
+def read_json_source(json_path, options):
+    ndjson = detect_ndjson(json_path, options.get("ndjson"))
+    start = options.get("start_offset") or 0
+    jsonfile, first_record, records = open_json_records(json_path, ndjson)
+    headers = list(first_record.keys())
+    
+    if ndjson and options.get("track_offsets"):
+        blocks, close, ends = open_text_blocks(json_path, start=start, end=options.get("end_offset"))
+        if ends is not None:
+            jsonfile.close()
+            offsets = deque()
+            groups = (parse_ndjson_block(block, ends[-1]) for block in blocks)
+            make_batch = lambda rows: [[row.get(col, "") for col in headers] for row in rows]
+            batches = iter_offset_batches(groups, ends, offsets, make_batch)
+            return make_source(headers, batches, close=close, offsets=offsets)
+        close()
+    elif start:
+        jsonfile.close()
+        raise ValueError("ادامه از میانه فایل فقط برای NDJSON ممکن است")
+    
+    batches = iter_batches(([row.get(col, "") for col in headers] for row in records), 1000)
+    return make_source(headers, batches, close=jsonfile.close)
+
+def sqlite_column_type(declared_type):
+    declared_type = (declared_type or "").upper()
+    if "INT" in declared_type:
+        return "INTEGER"
+    if "REAL" in declared_type or "FLOA" in declared_type or "DOUB" in declared_type:
+        return "REAL"
+    if "TIME" in declared_type:
+        return "DATETIME"
+    if "DATE" in declared_type:
+        return "DATE"
+    return "TEXT"
+
+def list_sqlite_tables(conn):
+    return [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name != ? AND name NOT LIKE 'sqlite_%'",
+        (CHECKPOINT_TABLE,))]
+
+def sqlite_select_clauses(options):
+    # filtering, ordering and limiting all happen inside SQLite, before any row reaches Python
+    clauses = []
+    params = []
+    if options.get("where"):
+        clauses.append(f"WHERE {options['where']}")
+    if options.get("order_by"):
+        clauses.append(f"ORDER BY {options['order_by']}")
+    if options.get("limit") is not None:
+        clauses.append("LIMIT ?")
+        params.append(int(options["limit"]))
+    return " ".join(clauses), params
+
+def open_sqlite_table(conn, table_name, options=None):
+    options = options or {}
+    cursor = conn.cursor()
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
+    create_table_result = cursor.fetchone()
+    create_table_sql = create_table_result[0] if create_table_result else ""
+    
+    cursor.execute(f"PRAGMA table_info({table_name})")
+    columns_info = cursor.fetchall()
+    declared_types = {col[1]: col[2] for col in columns_info}
+    
+    selected = options.get("columns")
+    if selected:
+        selected = [selected] if isinstance(selected, str) else list(selected)
+        missing = [col for col in selected if col not in declared_types]
+        if missing:
+            raise ValueError(f"ستون‌ها در جدول '{table_name}' وجود ندارند: {', '.join(missing)}")
+        # the stored schema no longer matches, so SQL output writes one for the chosen columns
+        create_table_sql = ""
+        select_list = ', '.join([quote_sql_identifier(col) for col in selected])
+    else:
+        selected = list(declared_types)
+        select_list = "*"
+        if not create_table_sql:
+            columns = [f"{col[1]} {col[2]}" for col in columns_info]
+            create_table_sql = f"CREATE TABLE {table_name} (\n    " + ",\n    ".join(columns) + "\n)"
+    
+    column_types = [sqlite_column_type(declared_types[col]) for col in selected]
+    clauses, params = sqlite_select_clauses(options)
+    cursor.execute(f"SELECT {select_list} FROM {table_name} {clauses}", params)
+    headers = [col[0] for col in cursor.description]
+    batches = iter_cursor_batches(cursor, options.get("fetch_size") or SQLITE_FETCH_SIZE)
+    return make_source(headers, batches, table_name=table_name, column_types=column_types,
+                       create_table_sql=create_table_sql, empty_as_null=False)
+
+def open_sqlite_query(conn, query, table_name=None, fetch_size=SQLITE_FETCH_SIZE):
+    # a query is only ever a read; anything that would write fails instead
+    conn.execute("PRAGMA query_only = ON")
+    cursor = conn.cursor()
+    cursor.execute(query)
+    if cursor.description is None:
+        raise ValueError("پرس‌وجو هیچ ستونی برنمی‌گرداند")
+    
+    headers = [col[0] for col in cursor.description]
+    # result columns carry no declared types, so typed outputs infer them from rows they can convert in place
+    batches = (list(map(list, rows)) for rows in iter_cursor_batches(cursor, fetch_size or SQLITE_FETCH_SIZE))
+    return make_source(headers, batches, table_name=table_name or "query", empty_as_null=False)
+
+def read_sqlite_source(db_path, options):
+    conn = sqlite3.connect(db_path)
+    try:
+        table_name = options.get("table_name")
         
-        if not lines:
-            raise ValueError("فایل TXT خالی است")
+        if options.get("query"):
+            source = open_sqlite_query(conn, options["query"], table_name, options.get("fetch_size"))
+            log(f"پرس‌وجو با {len(source['headers'])} ستون اجرا شد", "STATS")
+            source["close"] = conn.close
+            return source
         
-        if not delimiter:
-            delimiters = ['|', ',', ';', '\t', ':', '#', '~']
-            max_count = 0
+        if not table_name:
+            tables = list_sqlite_tables(conn)
             
-            for delim in delimiters:
-                count = lines[0].count(delim)
-                if count > max_count:
-                    max_count = count
-                    delimiter = delim
-        
-        log(f"جداکننده تشخیص داده شده: '{delimiter}'", "STATS")
+            if not tables:
+                raise ValueError("هیچ جدولی در دیتابیس یافت نشد")
+            
+            if len(tables) == 1:
+                table_name = tables[0]
+            else:
+                table_name = select_from_list(tables, "جدول")
+                if not table_name:
+                    conn.close()
+                    return None
         
-        headers = lines[0].split(delimiter)
-        start_idx = 1
+        source = open_sqlite_table(conn, table_name, options)
+    except Exception:
+        conn.close()
+        raise
+    
+    log(f"جدول '{table_name}' با {len(source['headers'])} ستون انتخاب شد", "STATS")
+    source["close"] = conn.close
+    return source
+
+def read_sql_source(sql_path, options):
+    close, table_name, headers, row_batches = open_sql_rows(sql_path, options.get("backslash_escapes"))
+    log(f"جدول '{table_name}' با {len(headers)} ستون شناسایی شد", "STATS")
+    return make_source(headers, row_batches, table_name=table_name, close=close, empty_as_null=False)
+
+def write_csv_target(csv_path, source, options):
+    row_count = 0
+    with open_text_stream(csv_path, 'a' if options.get("append") else 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        if options.get("header", True):
+            writer.writerow(source["headers"])
+        for batch in source["batches"]:
+            writer.writerows(iter_column_rows(batch))
+            row_count += batch["size"]
+    return row_count
+
+def encode_json_column(batch, i, encode):
+    formatted = format_number_column(batch, i)
+    if formatted is not None:
+        return formatted
+    if batch["kinds"][i] == "text":
+        return list(map(json.encoder.encode_basestring, batch["columns"][i]))
+    return list(map(encode, column_values(batch, i)))
+
+def write_json_target(json_path, source, options):
+    ndjson = options.get("ndjson")
+    if ndjson is None:
+        ndjson = is_ndjson_path(json_path)
+    
+    headers = source["headers"]
+    indent = options.get("indent")
+    with open_text_stream(json_path, 'a' if options.get("append") else 'w') as jsonfile:
+        if (indent and not ndjson) or len(set(headers)) != len(headers):
+            items = (dict(zip(headers, row)) for batch in source["batches"] for row in iter_column_rows(batch))
+            return write_json_records(jsonfile, items, ndjson, indent, options.get("progress"))
+        
+        # each record is filled from a template of pre-encoded keys, one column encoded at a time
+        encode = json_record_encoder(ndjson)
+        template = "{" + ",".join(encode(header).replace("%", "%%") + ":%s" for header in headers) + "}"
+        texts = (template % values for batch in source["batches"]
+                 for values in zip(*[encode_json_column(batch, i, encode) for i in range(len(headers))]))
+        return write_json_lines(jsonfile, texts, ndjson, options.get("progress"))
+
+def write_txt_target(txt_path, source, options):
+    delimiter = options.get("delimiter") or "|"
+    row_count = 0
+    with open_text_stream(txt_path, 'a' if options.get("append") else 'w') as txtfile:
+        if options.get("header", True):
+            txtfile.write(delimiter.join(source["headers"]) + "\n")
+        for batch in source["batches"]:
+            columns = [batch["columns"][i] if kind == "text" else
+                       [str(item) if item is not None else "" for item in column_values(batch, i)]
+                       for i, kind in enumerate(batch["kinds"])]
+            lines = [delimiter.join(values) for values in zip(*columns)]
+            if lines:
+                txtfile.write("\n".join(lines) + "\n")
+            row_count += batch["size"]
+    return row_count
+
+def write_sqlite_target(db_path, source, options):
+    headers = source["headers"]
+    table_name = options.get("table_name") or source["table_name"] or "data"
+    column_types = source["column_types"] or ["TEXT"] * len(headers)
+    bulk_load = options.get("bulk_load", False)
         
-        conn = sqlite3.connect(db_path)
+    conn = connect_sqlite_target(db_path, bulk_load)
+    try:
         cursor = conn.cursor()
         
         create_table_sql = f"""
         CREATE TABLE IF NOT EXISTS {table_name} (
-            {', '.join([f'"{col}" TEXT' for col in headers])}
+            {', '.join([f'"{col}" {col_type}' for col, col_type in zip(headers, column_types)])}
         )
         """
         cursor.execute(create_table_sql)
         
-        insert_sql = f"""
-        INSERT INTO {table_name} ({', '.join([f'"{col}"' for col in headers])})
-        VALUES ({', '.join(['?' for _ in headers])})
-        """
+        checkpoint = options.get("checkpoint")
+        prepare_checkpoints(cursor, table_name, checkpoint is not None)
+        offsets = source.get("offsets")
         
-        row_count = 0
-        batch_size = 1000
-        batch_data = []
+        keys = options.get("keys")
+        content_hash = options.get("content_hash", False)
+        if content_hash and not keys:
+            raise ValueError("ستون هش محتوا فقط همراه با ستون‌های کلید قابل استفاده است")
         
-        for line in lines[start_idx:]:
-            values = line.split(delimiter)
-            if len(values) == len(headers):
-                batch_data.append(values)
-                
-                if len(batch_data) >= batch_size:
-                    cursor.executemany(insert_sql, batch_data)
-                    row_count += len(batch_data)
-                    batch_data = []
+        if keys:
+            keys = [keys] if isinstance(keys, str) else list(keys)
+            insert_sql = prepare_upsert(cursor, table_name, headers, keys, content_hash)
+        else:
+            insert_sql = f"""
+            INSERT INTO {table_name} ({', '.join([f'"{col}"' for col in headers])})
+            VALUES ({', '.join(['?' for _ in headers])})
+            """
+        
+        row_count = 0
+        changed_count = 0
+        committed = 0
+        for batch in source["batches"]:
+            rows = iter_column_rows(batch)
+            if content_hash:
+                rows = (row + (row_hash(row),) for row in rows)
+            cursor.executemany(insert_sql, rows)
+            changed_count += cursor.rowcount
+            row_count += batch["size"]
+        
+            if row_count // 10000 != (row_count - batch["size"]) // 10000:
+                log(f"تاکنون {row_count} ردیف ذخیره شد", "STATS")
+        
+            if checkpoint is not None:
+                offset = pop_batch_offset(offsets, row_count) if offsets is not None else None
+                # with byte offsets, only batches that end on a known boundary can be resumed from
+                if row_count - committed >= CHECKPOINT_ROWS and (offsets is None or offset is not None):
+                    save_checkpoint(cursor, table_name, checkpoint, offset, checkpoint["base_rows"] + row_count)
+                    conn.commit()
+                    committed = row_count
+        
+        if checkpoint is not None:
+            save_checkpoint(cursor, table_name, checkpoint, checkpoint["end"],
+                            checkpoint["base_rows"] + row_count, completed=True)
+        
+        finish_sqlite_target(conn, table_name, options.get("indexes"), bulk_load)
+    finally:
+        conn.close()
+    
+    log(f"جدول '{table_name}' ایجاد شد:", "STATS")
+    log(f"  • تعداد سطرها: {row_count}", "STATS")
+    log(f"  • تعداد ستون‌ها: {len(headers)}", "STATS")
+    if keys:
+        log(f"  • سطرهای درج یا به‌روزرسانی‌شده: {changed_count}", "STATS")
+        log(f"  • سطرهای بدون تغییر: {row_count - changed_count}", "STATS")
+    return row_count
+
+def write_sql_header(sqlfile, table_name, headers, column_types, create_table_sql, dialect, infer_types=True):
+    if create_table_sql:
+        sqlfile.write(f"-- SQL dump of table '{table_name}'\n")
+        sqlfile.write(f"-- Generated by Database Converter\n\n")
+        sqlfile.write(f"{create_table_sql};\n\n")
+        sqlfile.write(f"-- داده‌های جدول '{table_name}'\n")
+        return
+    
+    sql_types = SQL_DIALECTS[dialect]["types"]
+    sqlfile.write(f"-- ایجاد جدول {table_name}\n")
+    sqlfile.write(f"CREATE TABLE {quote_sql_identifier(table_name, dialect)} (\n")
+    
+    columns = []
+    for header, column_type in zip(headers, column_types):
+        sql_type = sql_types[column_type] if infer_types else sql_types["TEXT"]
+        columns.append(f"    {quote_sql_identifier(header, dialect)} {sql_type}")
+    
+    sqlfile.write(",\n".join(columns))
+    sqlfile.write("\n);\n\n")
+    sqlfile.write(f"-- درج داده‌ها در جدول {table_name}\n")
+
+def write_sql_target(sql_path, source, options):
+    headers = source["headers"]
+    table_name = options.get("table_name") or source["table_name"] or "data"
+    column_types = source["column_types"] or ["TEXT"] * len(headers)
+    empty_as_null = source["empty_as_null"]
+    dialect = options.get("dialect") or "sqlite"
+    if dialect not in SQL_DIALECTS:
+        raise ValueError(f"گویش SQL ناشناخته: {dialect}")
+    
+    # a schema read from SQLite is only reused verbatim when the dump is for SQLite again
+    create_table_sql = source.get("create_table_sql") if dialect == "sqlite" else None
+    quoted_table = quote_sql_identifier(table_name, dialect)
+    quoted_headers = ', '.join([quote_sql_identifier(header, dialect) for header in headers])
+    row_count = 0
+    
+    with open_text_stream(sql_path, 'a' if options.get("append") else 'w') as sqlfile:
+        if options.get("header", True):
+            write_sql_header(sqlfile, table_name, headers, column_types, create_table_sql, dialect,
+                             options.get("infer_types", True))
+        
+        if dialect == "postgresql":
+            # psql streams a COPY block straight into the table, with no statement size to respect
+            for batch in source["batches"]:
+                if not batch["size"]:
+                    continue
+                if not row_count:
+                    sqlfile.write(f"COPY {quoted_table} ({quoted_headers}) FROM stdin;\n")
+                columns = [format_copy_column(batch, i, empty_as_null) for i in range(len(headers))]
+                sqlfile.write("".join(["\t".join(values) + "\n" for values in zip(*columns)]))
+                row_count += batch["size"]
+            if row_count:
+                sqlfile.write("\\.\n\n")
+                if not options.get("quiet"):
+                    log("  • یک بلوک COPY نوشته شد", "STATS")
+            return row_count
+        
+        escape = SQL_DIALECTS[dialect]["escape"]
+        non_finite = SQL_DIALECTS[dialect]["non_finite"]
+        
+        def iter_values_lists():
+            nonlocal row_count
+            for batch in source["batches"]:
+                columns = [format_sql_column(batch, i, empty_as_null, escape, non_finite) for i in range(len(headers))]
+                yield ["    (" + ", ".join(values) + ")" for values in zip(*columns)]
+                row_count += batch["size"]
+        
+        statement_count = write_sql_inserts(sqlfile, f"INSERT INTO {quoted_table} ({quoted_headers}) VALUES\n",
+                                            iter_values_lists(), options.get("rows_per_statement"),
+                                            options.get("max_statement_bytes"))
+    
+    if not options.get("quiet"):
+        log(f"  • تعداد INSERT statement: {statement_count}", "STATS")
+    return row_count
+
+READERS = {
+    "csv": read_csv_source,
+    "json": read_json_source,
+    "sqlite": read_sqlite_source,
+    "sql": read_sql_source,
+    "txt": read_txt_source,
+}
+
+WRITERS = {
+    "csv": write_csv_target,
+    "json": write_json_target,
+    "sqlite": write_sqlite_target,
+    "sql": write_sql_target,
+    "txt": write_txt_target,
+}
+# writers that take each batch row by row rather than column by column
+ROW_WRITERS = {"csv", "sqlite"}
+
+PARTITION_FLUSH_ROWS = 10000
+PARTITION_BUFFER_ROWS = 200000
+SHARD_PROBE_ROWS = 100
+HIVE_DEFAULT_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+HIVE_ESCAPE = re.compile(r'[\x00-\x1f\x7f"#%\'*/:=?\\^{}\[\]<>|]')
+
+def slice_column_batch(batch, start, stop):
+    return {"size": stop - start, "columns": [column[start:stop] for column in batch["columns"]], "kinds": batch["kinds"]}
+
+def take_column_batch(batch, rows):
+    columns = []
+    for column in batch["columns"]:
+        if isinstance(column, list):
+            columns.append([column[i] for i in rows])
+        elif isinstance(column, array):
+            columns.append(array(column.typecode, map(column.__getitem__, rows)))
+        else:
+            columns.append(column[rows])
+    return {"size": len(rows), "columns": columns, "kinds": batch["kinds"]}
+
+def split_batches(batches, row_count):
+    head = []
+    for i, batch in enumerate(batches):
+        if row_count <= 0:
+            return head, batches[i:]
+        if batch["size"] > row_count:
+            head.append(slice_column_batch(batch, 0, row_count))
+            return head, [slice_column_batch(batch, row_count, batch["size"])] + batches[i + 1:]
+        head.append(batch)
+        row_count -= batch["size"]
+    return head, []
+
+def shard_manifest_path(output_path):
+    return f"{os.path.splitext(split_compression_ext(output_path)[0])[0]}.manifest.json"
+
+def write_shard_manifest(manifest_path, output_format, headers, shards, **extra):
+    root = os.path.dirname(os.path.abspath(manifest_path))
+    manifest = {"format": output_format, "columns": headers}
+    manifest.update(extra)
+    manifest["rows"] = sum(shard["rows"] for shard in shards)
+    manifest["bytes"] = sum(shard["bytes"] for shard in shards)
+    manifest["shards"] = [dict(shard, path=os.path.relpath(shard["path"], root).replace(os.sep, "/")) for shard in shards]
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    log(f"{len(shards)} فایل بخش‌بندی‌شده نوشته شد؛ فهرست: {manifest_path}", "STATS")
+
+def append_shard_batches(output_format, target, source, options):
+    # every write opens, appends and closes, so a shard's size on disk is exact between writes
+    shard_rows = options.get("shard_rows")
+    shard_bytes = options.get("shard_bytes")
+    batches = target["pending"]
+    target["pending"], target["pending_rows"] = [], 0
+    shards = target["shards"]
+    
+    while batches:
+        shard = shards[-1] if shards else None
+        if shard is None or (shard_rows and shard["rows"] >= shard_rows) or (shard_bytes and shard["bytes"] >= shard_bytes):
+            shard = dict(target["entry"], path=target["shard_path"](len(shards)), rows=0, bytes=0)
+            shards.append(shard)
+            os.makedirs(os.path.dirname(shard["path"]) or ".", exist_ok=True)
+        
+        # a byte cap can only be checked after a write, so those shards are filled one batch at a time
+        chunk, batches = (batches[:1], batches[1:]) if shard_bytes else (batches, [])
+        if shard_rows:
+            chunk, rest = split_batches(chunk, shard_rows - shard["rows"])
+            batches = rest + batches
+        
+        # the first write to a shard lays down its header; later ones add bare rows
+        fresh = not shard["rows"]
+        shard["rows"] += WRITERS[output_format](shard["path"], dict(source, batches=chunk),
+                                                dict(options, header=fresh, append=not fresh))
+        shard["bytes"] = os.path.getsize(shard["path"])
+
+def write_sharded_target(output_format, output_path, source, options):
+    writer = WRITERS[output_format]
+    shard_rows = options.get("shard_rows")
+    shard_bytes = options.get("shard_bytes")
+    ndjson = options.get("ndjson")
+    if ndjson is None:
+        ndjson = is_ndjson_path(output_path)
+    
+    if shard_bytes and (output_format != "json" or ndjson):
+        target = {"shard_path": lambda index: shard_path(output_path, index), "entry": {},
+                  "shards": [], "pending": [], "pending_rows": 0}
+        # a shard is written in many small appends, so the writers' own reports are left out
+        append_options = dict(options, quiet=True)
+        for batch in source["batches"]:
+            target["pending"].append(batch)
+            append_shard_batches(output_format, target, source, append_options)
+        shards = target["shards"]
+        if not shards:
+            # an empty input still leaves one shard with the header
+            path = shard_path(output_path, 0)
+            writer(path, dict(source, batches=[]), options)
+            shards.append({"path": path, "rows": 0, "bytes": os.path.getsize(path)})
+    else:
+        # one writer runs per shard over a slice of the batch stream, so nothing is held back between shards;
+        # a JSON array cannot be appended to, so its byte cap is checked against the size the writer has encoded
+        # (for compressed output that is the size before compression)
+        batches = iter(source["batches"])
+        pending = next(batches, None)
+        shards = []
+        encoded = {"bytes": 0, "rows": 0}
+        while pending is not None or not shards:
+            path = shard_path(output_path, len(shards))
+            row_count = 0
+            progress = {"bytes": 0}
+            
+            def iter_shard_batches():
+                nonlocal pending, row_count
+                while pending is not None:
+                    batch = pending
+                    split = shard_rows - row_count if shard_rows else batch["size"]
+                    if shard_bytes:
+                        # rows are handed over only as far as the cap, judged by the size of the rows encoded so far
+                        rows = encoded["rows"] + row_count
+                        size = encoded["bytes"] + progress["bytes"]
+                        fit = -(-(shard_bytes - progress["bytes"]) * rows // size) if rows and size else SHARD_PROBE_ROWS
+                        split = min(split, max(1, fit))
+                    if batch["size"] > split:
+                        batch, pending = slice_column_batch(batch, 0, split), slice_column_batch(batch, split, batch["size"])
+                    else:
+                        pending = next(batches, None)
+                    row_count += batch["size"]
+                    yield batch
+                    if (shard_rows and row_count >= shard_rows) or (shard_bytes and progress["bytes"] >= shard_bytes):
+                        return
+            
+            rows = writer(path, dict(source, batches=iter_shard_batches()), dict(options, progress=progress))
+            shards.append({"path": path, "rows": rows, "bytes": os.path.getsize(path)})
+            encoded["bytes"] += progress["bytes"]
+            encoded["rows"] += rows
+    
+    write_shard_manifest(shard_manifest_path(output_path), output_format, source["headers"], shards)
+    return sum(shard["rows"] for shard in shards)
+
+def hive_escape(text):
+    return HIVE_ESCAPE.sub(lambda m: f"%{ord(m.group()):02X}", str(text))
+
+def partition_dir_name(column, value):
+    value = HIVE_DEFAULT_PARTITION if value is None or value == "" else hive_escape(value)
+    return f"{hive_escape(column)}={value}"
+
+def write_partitioned_target(output_format, output_path, source, options):
+    column = options["partition_by"]
+    headers = source["headers"]
+    if column not in headers:
+        raise ValueError(f"ستون بخش‌بندی یافت نشد: {column}")
+    
+    # like Hive, the partition column lives in the directory name rather than in the files
+    index = headers.index(column)
+    keep = [i for i in range(len(headers)) if i != index]
+    column_types = source["column_types"]
+    part_source = dict(source, headers=[headers[i] for i in keep], create_table_sql=None,
+                       column_types=[column_types[i] for i in keep] if column_types else None)
+    # rows are appended to a partition as they arrive, and a JSON array cannot be appended to;
+    # the writers' reports for each of those appends are left out
+    part_options = dict(options, ndjson=True, quiet=True)
+    base, codec = split_compression_ext(output_path)
+    ext = ".ndjson" if output_format == "json" else os.path.splitext(base)[1] or f".{OUTPUT_EXTENSIONS[output_format]}"
+    if codec:
+        ext += f".{COMPRESSION_SUFFIXES[codec]}"
+    
+    os.makedirs(output_path, exist_ok=True)
+    partitions = {}
+    pending_rows = 0
+    for batch in source["batches"]:
+        groups = {}
+        for row, value in enumerate(column_values(batch, index)):
+            groups.setdefault(value, []).append(row)
+        batch = {"size": batch["size"], "columns": [batch["columns"][i] for i in keep],
+                 "kinds": [batch["kinds"][i] for i in keep]}
+        
+        for value, rows in groups.items():
+            name = partition_dir_name(column, value)
+            partition = partitions.get(name)
+            if partition is None:
+                partition_dir = os.path.join(output_path, name)
+                partition = partitions[name] = {
+                    "shard_path": lambda index, root=partition_dir: os.path.join(root, f"part-{index:04d}{ext}"),
+                    "entry": {"partition": {column: None if value is None or value == "" else str(value)}},
+                    "shards": [], "pending": [], "pending_rows": 0,
+                }
+            partition["pending"].append(batch if len(rows) == batch["size"] else take_column_batch(batch, rows))
+            partition["pending_rows"] += len(rows)
+            pending_rows += len(rows)
+            if partition["pending_rows"] >= PARTITION_FLUSH_ROWS:
+                pending_rows -= partition["pending_rows"]
+                append_shard_batches(output_format, partition, part_source, part_options)
+        
+        if pending_rows >= PARTITION_BUFFER_ROWS:
+            for partition in partitions.values():
+                if partition["pending"]:
+                    append_shard_batches(output_format, partition, part_source, part_options)
+            pending_rows = 0
+    
+    for partition in partitions.values():
+        if partition["pending"]:
+            append_shard_batches(output_format, partition, part_source, part_options)
+    
+    shards = [shard for name in sorted(partitions) for shard in partitions[name]["shards"]]
+    write_shard_manifest(os.path.join(output_path, "_manifest.json"), output_format, part_source["headers"], shards,
+                         partition_by=column)
+    return sum(shard["rows"] for shard in shards)
+
+def write_table_source(output_format, output_path, source, write_options, infer_types, sample_size):
+    if infer_types and source["column_types"] is None:
+        source["column_types"], source["batches"] = prepare_typed_batches(
+            source["batches"], len(source["headers"]), True, sample_size)
+    if infer_types:
+        log(f"نوع ستون‌ها: {', '.join(source['column_types'])}", "STATS")
+    
+    column_types = source["column_types"]
+    partition_by = output_format != "sqlite" and write_options.get("partition_by")
+    sharded = output_format != "sqlite" and (write_options.get("shard_rows") or write_options.get("shard_bytes"))
+    if output_format in ROW_WRITERS and not (partition_by or sharded):
+        # these writers hand rows straight on, so packing them into columns would only be undone
+        source["batches"] = map(make_row_batch, source["batches"])
+    else:
+        source["batches"] = (make_column_batch(batch, column_types) for batch in source["batches"])
+    
+    if partition_by:
+        return write_partitioned_target(output_format, output_path, source, write_options)
+    if sharded:
+        return write_sharded_target(output_format, output_path, source, write_options)
+    return WRITERS[output_format](output_path, source, write_options)
+
+def table_output_path(output_format, output_path, table_name):
+    if output_format == "sqlite":
+        return output_path
+    file_name = re.sub(r'[<>:"/\\|?*]', '_', table_name)
+    return os.path.join(output_path, f"{file_name}.{OUTPUT_EXTENSIONS[output_format]}")
+
+def sqlite_rowid_mark(db_path, table_name):
+    # rows inserted from here on get rowids above the largest one the table holds now
+    conn = sqlite3.connect(db_path)
+    try:
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ? COLLATE NOCASE",
+                            (table_name,)).fetchone():
+            return 0
+        try:
+            return conn.execute(f"SELECT max(rowid) FROM {quote_sql_identifier(table_name)}").fetchone()[0] or 0
+        except sqlite3.OperationalError:
+            # a WITHOUT ROWID table gives no way to tell new rows from old ones
+            return None
+    finally:
+        conn.close()
+
+def convert_tables(input_format, output_format, input_path, output_path, read_options, write_options,
+                   infer_types, sample_size):
+    if output_format != "sqlite":
+        os.makedirs(output_path, exist_ok=True)
+    
+    def convert_table(table_name, source):
+        log(f"جدول '{table_name}' با {len(source['headers'])} ستون", "STATS")
+        return write_table_source(output_format, table_output_path(output_format, output_path, table_name),
+                                  source, dict(write_options, table_name=table_name), infer_types, sample_size)
+    
+    if input_format == "sql":
+        # a dump is one stream, so its tables are written one after another as they go past
+        backslash_escapes = read_options.get("backslash_escapes")
+        if backslash_escapes is None:
+            backslash_escapes = detect_backslash_escapes(input_path)
+        events, close = open_sql_events(input_path, backslash_escapes)
+        strays = set()
+        marks = {}
+        try:
+            row_counts = []
+            tables = []
+            for table_name, headers, row_batches in iter_sql_tables(events, strays):
+                if output_format == "sqlite":
+                    marks[table_name] = sqlite_rowid_mark(output_path, table_name)
+                source = make_source(headers, row_batches, table_name=table_name, empty_as_null=False)
+                row_counts.append((table_name, convert_table(table_name, source)))
+                tables.append((table_name, headers))
+        finally:
+            close()
+        if not row_counts:
+            raise ValueError("دستور CREATE TABLE در فایل SQL یافت نشد")
         
-        if batch_data:
-            cursor.executemany(insert_sql, batch_data)
-            row_count += len(batch_data)
+        # a table with rows outside its own CREATE block is written again from every INSERT that names it
+        for i, (table_name, headers) in enumerate(tables):
+            if table_name.lower() not in strays:
+                continue
+            if output_format == "sqlite":
+                if marks[table_name] is None:
+                    log(f"ردیف‌های جدول '{table_name}' در چند جای فایل SQL هستند و فقط ردیف‌های همراه CREATE ذخیره شد", "WARNING")
+                    continue
+                # only the rows this run added are taken back; what the table held before stays
+                conn = sqlite3.connect(output_path)
+                try:
+                    conn.execute(f"DELETE FROM {quote_sql_identifier(table_name)} WHERE rowid > ?", (marks[table_name],))
+                    conn.commit()
+                finally:
+                    conn.close()
+            log(f"ردیف‌های جدول '{table_name}' در چند جای فایل SQL هستند؛ جدول دوباره خوانده می‌شود", "WARNING")
+            events, close = open_sql_events(input_path, backslash_escapes)
+            try:
+                source = make_source(headers, iter_sql_table_rows(events, table_name, headers),
+                                     table_name=table_name, empty_as_null=False)
+                row_counts[i] = (table_name, convert_table(table_name, source))
+            finally:
+                close()
+        return row_counts
+    
+    if input_format != "sqlite":
+        raise ValueError("خروجی همه جدول‌ها فقط برای ورودی SQLite و SQL ممکن است")
+    
+    # one connection inside one read transaction: every table comes from the same snapshot
+    conn = sqlite3.connect(input_path, check_same_thread=False)
+    try:
+        conn.execute("BEGIN")
+        tables = read_options.get("tables") or list_sqlite_tables(conn)
+        if not tables:
+            raise ValueError("هیچ جدولی در دیتابیس یافت نشد")
+        
+        workers = min(read_options.get("workers") or SQLITE_EXPORT_WORKERS, len(tables))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(convert_table, table_name, open_sqlite_table(conn, table_name, read_options))
+                       for table_name in tables]
+            return [(table_name, future.result()) for table_name, future in zip(tables, futures)]
+    finally:
+        conn.close()
+
+def copy_sqlite_tables(source_path, target_path, tables=None, target_table=None, columns=None, where=None):
+    if not tables and target_table is None and columns is None and where is None and \
+            (not os.path.exists(target_path) or os.path.getsize(target_path) == 0):
+        # a new file takes the whole database page by page, indexes and all
+        source = sqlite3.connect(source_path)
+        target = sqlite3.connect(target_path)
+        try:
+            source.backup(target)
+            copied = [(table_name, None) for table_name in list_sqlite_tables(target)]
+        finally:
+            target.close()
+            source.close()
+        log("کل دیتابیس با backup API کپی شد", "INFO")
+        return copied
+    
+    conn = sqlite3.connect(target_path)
+    try:
+        conn.execute("ATTACH DATABASE ? AS source_db", (source_path,))
+        tables = tables or [row[0] for row in conn.execute(
+            "SELECT name FROM source_db.sqlite_master WHERE type='table' AND name != ? AND name NOT LIKE 'sqlite_%'",
+            (CHECKPOINT_TABLE,))]
+        if not tables:
+            raise ValueError("هیچ جدولی در دیتابیس یافت نشد")
+        if target_table and len(tables) != 1:
+            raise ValueError("نام جدول مقصد فقط برای کپی یک جدول قابل استفاده است")
+        
+        where_clause = f"WHERE {where}" if where else ""
+        copied = []
+        for table_name in tables:
+            target_name = target_table or table_name
+            source_columns = conn.execute(f"PRAGMA source_db.table_info({quote_sql_identifier(table_name)})").fetchall()
+            if not source_columns:
+                raise ValueError(f"جدول '{table_name}' در دیتابیس مبدأ وجود ندارد")
+            declared_types = {col[1]: col[2] for col in source_columns}
+            selected = list(columns) if columns else list(declared_types)
+            missing = [col for col in selected if col not in declared_types]
+            if missing:
+                raise ValueError(f"ستون‌ها در جدول '{table_name}' وجود ندارند: {', '.join(missing)}")
+            
+            exists = conn.execute("SELECT 1 FROM main.sqlite_master WHERE type='table' AND name=?", (target_name,)).fetchone()
+            index_sql = []
+            if not exists and target_name == table_name and not columns:
+                # an untouched table keeps its exact schema, and its indexes are rebuilt after the rows
+                conn.execute(conn.execute("SELECT sql FROM source_db.sqlite_master WHERE type='table' AND name=?",
+                                          (table_name,)).fetchone()[0])
+                index_sql = [row[0] for row in conn.execute(
+                    "SELECT sql FROM source_db.sqlite_master WHERE type='index' AND tbl_name=? AND sql IS NOT NULL",
+                    (table_name,))]
+            elif not exists:
+                definitions = ', '.join([f"{quote_sql_identifier(col)} {declared_types[col]}".rstrip() for col in selected])
+                conn.execute(f"CREATE TABLE {quote_sql_identifier(target_name)} ({definitions})")
+            
+            quoted_columns = ', '.join([quote_sql_identifier(col) for col in selected])
+            cursor = conn.execute(f"""
+            INSERT INTO main.{quote_sql_identifier(target_name)} ({quoted_columns})
+            SELECT {quoted_columns} FROM source_db.{quote_sql_identifier(table_name)}
+            {where_clause}
+            """)
+            copied.append((target_name, cursor.rowcount))
+            
+            for sql in index_sql:
+                conn.execute(sql)
         
         conn.commit()
+        return copied
+    finally:
+        conn.close()
+
+def connect_sqlite_readonly(db_path):
+    return sqlite3.connect(f"file:{pathname2url(os.path.abspath(db_path))}?mode=ro", uri=True)
+
+def plan_rowid_ranges(db_path, table_name, partitions):
+    conn = connect_sqlite_readonly(db_path)
+    try:
+        low, high = conn.execute(f"SELECT min(rowid), max(rowid) FROM {table_name}").fetchone()
+    except sqlite3.OperationalError:
+        # WITHOUT ROWID tables have nothing to split on
+        return None
+    finally:
+        conn.close()
+    
+    if low is None:
+        return None
+    step = (high - low) // partitions + 1
+    return [(start, min(start + step - 1, high)) for start in range(low, high + 1, step)]
+
+def shard_path(output_path, index):
+    base, codec = split_compression_ext(output_path)
+    stem, ext = os.path.splitext(base)
+    return f"{stem}.part-{index:04d}{ext}" + (f".{COMPRESSION_SUFFIXES[codec]}" if codec else "")
+
+def open_binary_output(path):
+    codec = split_compression_ext(path)[1]
+    return open_compressed_binary(path, codec, 'w') if codec else open(path, 'wb')
+
+def export_sqlite_range(db_path, table_name, rowid_range, output_format, part_path, read_options, write_options,
+                        infer_types, sample_size):
+    global LOG_QUIET
+    # runs in a worker process; the parent reports totals, so per-part logging is muted
+    LOG_QUIET = True
+    where = f"rowid BETWEEN {rowid_range[0]} AND {rowid_range[1]}"
+    if read_options.get("where"):
+        where = f"({read_options['where']}) AND {where}"
+    
+    conn = connect_sqlite_readonly(db_path)
+    try:
+        source = open_sqlite_table(conn, table_name, dict(read_options, where=where))
+        return write_table_source(output_format, part_path, source, write_options, infer_types, sample_size)
+    finally:
         conn.close()
+
+def copy_json_records(parts, out):
+    # NDJSON parts become one array: every newline but the last turns into a record separator
+    out.write(b"[\n")
+    pending = False
+    written = False
+    for part in parts:
+        with open(part, 'rb') as f:
+            while True:
+                chunk = f.read(STREAM_BUFFER_SIZE)
+                if not chunk:
+                    break
+                if pending:
+                    out.write(b",\n")
+                pending = chunk.endswith(b"\n")
+                out.write((chunk[:-1] if pending else chunk).replace(b"\n", b",\n"))
+                written = True
+    out.write(b"\n]\n" if written else b"]\n")
+
+def export_sqlite_partitions(db_path, output_format, output_path, read_options, write_options, infer_types, sample_size):
+    if read_options.get("query") or read_options.get("order_by") or read_options.get("limit") is not None:
+        log("ORDER BY، LIMIT و پرس‌وجوی دلخواه به ترتیب سراسری نیاز دارند؛ خروجی موازی غیرفعال شد", "WARNING")
+        return None
+    if write_options.get("shard_rows") or write_options.get("shard_bytes") or write_options.get("partition_by"):
+        log("خروجی بخش‌بندی‌شده بر اساس ردیف، حجم یا ستون به صورت موازی نوشته نمی‌شود", "WARNING")
+        return None
+    ndjson = write_options.get("ndjson")
+    if ndjson is None:
+        ndjson = is_ndjson_path(split_compression_ext(output_path)[0])
+    if output_format == "json" and write_options.get("indent") and not ndjson:
+        log("JSON با تورفتگی به صورت موازی نوشته نمی‌شود", "WARNING")
+        return None
+    
+    table_name = read_options.get("table_name") or resolve_sqlite_table(db_path)
+    ranges = plan_rowid_ranges(db_path, table_name, read_options["partitions"])
+    if not ranges:
+        log(f"جدول '{table_name}' خالی است یا rowid ندارد؛ خروجی موازی غیرفعال شد", "WARNING")
+        return None
+    
+    read_options = dict(read_options, table_name=table_name)
+    workers = read_options.get("workers") or min(len(ranges), os.cpu_count() or 1)
+    shard = read_options.get("shard")
+    log(f"خروجی موازی: {len(ranges)} بازه rowid با {workers} پردازه", "INFO")
+    
+    if shard:
+        part_dir = None
+        part_paths = [shard_path(output_path, i) for i in range(len(ranges))]
+        part_options = write_options
+    else:
+        # parts hold bare rows; the header is written once and the parts are appended in rowid order
+        part_dir = tempfile.mkdtemp(prefix=".parts-", dir=os.path.dirname(os.path.abspath(output_path)))
+        part_paths = [os.path.join(part_dir, f"part-{i:04d}") for i in range(len(ranges))]
+        part_options = dict(write_options, header=False, ndjson=True)
+    
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(export_sqlite_range, db_path, table_name, rowid_range, output_format, part_path,
+                                   read_options, part_options, infer_types, sample_size)
+                       for rowid_range, part_path in zip(ranges, part_paths)]
+            
+            if shard:
+                row_count = sum(future.result() for future in futures)
+                log(f"{len(part_paths)} فایل بخش‌بندی‌شده نوشته شد", "STATS")
+                return row_count
+            
+            for future in futures:
+                future.result()
+        
+        with open_binary_output(output_path) as out:
+            if output_format == "json" and not ndjson:
+                copy_json_records(part_paths, out)
+            else:
+                if output_format != "json":
+                    # the writer's own output for no rows is exactly the header the parts left out
+                    header_path = os.path.join(part_dir, "header")
+                    conn = connect_sqlite_readonly(db_path)
+                    try:
+                        source = open_sqlite_table(conn, table_name, dict(read_options, limit=0))
+                        write_table_source(output_format, header_path, source, write_options, False, sample_size)
+                    finally:
+                        conn.close()
+                    part_paths = [header_path] + part_paths
+                for part_path in part_paths:
+                    with open(part_path, 'rb') as f:
+                        shutil.copyfileobj(f, out, STREAM_BUFFER_SIZE)
+        return sum(future.result() for future in futures)
+    finally:
+        if part_dir:
+            shutil.rmtree(part_dir, ignore_errors=True)
+
+def convert_file(input_format, output_format, input_path, output_path, read_options=None, write_options=None):
+    read_options = dict(read_options or {})
+    write_options = write_options or {}
+    title = f"{FORMAT_TITLES[input_format]} به {FORMAT_TITLES[output_format]}"
+    
+    try:
+        log(f"شروع تبدیل {title}", "INFO")
+        
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"{INPUT_LABELS[input_format]} یافت نشد: {input_path}")
+        
+        infer_types = output_format in TYPED_OUTPUTS and write_options.get("infer_types", True)
+        sample_size = write_options.get("sample_size") or TYPE_SAMPLE_SIZE
+        read_options.setdefault("infer_types", infer_types)
+        read_options.setdefault("sample_size", sample_size)
+        
+        if read_options.get("all_tables"):
+            for table_name, row_count in convert_tables(input_format, output_format, input_path, output_path,
+                                                        read_options, write_options, infer_types, sample_size):
+                log(f"  • {table_name}: {row_count} ردیف", "STATS")
+            log(f"همه جدول‌ها با موفقیت تبدیل شدند: {output_path}", "SUCCESS")
+            return True
+        
+        if input_format == "sqlite" and (read_options.get("partitions") or 0) > 1:
+            row_count = export_sqlite_partitions(input_path, output_format, output_path, read_options, write_options,
+                                                 infer_types, sample_size)
+            if row_count is not None:
+                log(f"{row_count} ردیف به {FORMAT_TITLES[output_format]} تبدیل شد", "STATS")
+                log(f"فایل {FORMAT_TITLES[output_format]} با موفقیت ایجاد شد: {output_path}", "SUCCESS")
+                return True
+        
+        checkpoint = None
+        if output_format == "sqlite" and (write_options.get("resume") or write_options.get("incremental")):
+            checkpoint = plan_checkpoint(input_format, input_path, output_path, read_options, write_options)
+            if checkpoint is None:
+                return True
+            write_options = dict(write_options, checkpoint=checkpoint)
+        
+        source = READERS[input_format](input_path, read_options)
+        if source is None:
+            return False
         
-        log(f"{row_count} ردیف در دیتابیس ذخیره شد", "STATS")
-        log(f"دیتابیس SQLite با موفقیت ایجاد شد: {db_path}", "SUCCESS")
+        try:
+            if checkpoint and checkpoint["base_rows"] and not read_options.get("start_offset"):
+                # readers without byte offsets re-read the input and drop what is already stored
+                log(f"رد شدن از {checkpoint['base_rows']} ردیف ذخیره‌شده", "INFO")
+                source["batches"] = skip_rows(source["batches"], checkpoint["base_rows"])
+                source["offsets"] = None
+            
+            row_count = write_table_source(output_format, output_path, source, write_options, infer_types, sample_size)
+        finally:
+            source["close"]()
+        
+        log(f"{row_count} ردیف به {FORMAT_TITLES[output_format]} تبدیل شد", "STATS")
+        if output_format == "sqlite":
+            log(f"دیتابیس SQLite با موفقیت ایجاد شد: {output_path}", "SUCCESS")
+        else:
+            log(f"فایل {FORMAT_TITLES[output_format]} با موفقیت ایجاد شد: {output_path}", "SUCCESS")
         return True
         
     except Exception as e:
-        log(f"خطا در تبدیل TXT به SQLite: {str(e)}", "ERROR")
+        log(f"خطا در تبدیل {title}: {str(e)}", "ERROR")
         return False
 
-def txt_to_sql(txt_path, sql_path, table_name="data", delimiter=None):
+def shard_options(shard_rows, shard_bytes, partition_by, **options):
+    return dict(options, shard_rows=shard_rows, shard_bytes=shard_bytes, partition_by=partition_by)
+
+def csv_to_json(csv_path, json_path, ndjson=None, indent=None, shard_rows=None, shard_bytes=None,
+                partition_by=None):
+    return convert_file("csv", "json", csv_path, json_path,
+                        write_options=shard_options(shard_rows, shard_bytes, partition_by, ndjson=ndjson,
+                                                    indent=indent))
+
+def csv_to_sqlite(csv_path, db_path, table_name="data", bulk_load=False, indexes=None, infer_types=True,
+                  sample_size=TYPE_SAMPLE_SIZE, workers=None, resume=False, incremental=False, keys=None,
+                  content_hash=False):
+    return convert_file("csv", "sqlite", csv_path, db_path,
+                        read_options={"workers": workers},
+                        write_options={"table_name": table_name, "bulk_load": bulk_load, "indexes": indexes,
+                                       "infer_types": infer_types, "sample_size": sample_size,
+                                       "resume": resume, "incremental": incremental,
+                                       "keys": keys, "content_hash": content_hash})
+
+def csv_to_sql(csv_path, sql_path, table_name="data", infer_types=True, sample_size=TYPE_SAMPLE_SIZE,
+               workers=None, dialect="sqlite", rows_per_statement=SQL_BATCH_SIZE,
+               max_statement_bytes=SQL_MAX_STATEMENT_BYTES, shard_rows=None, shard_bytes=None,
+               partition_by=None):
+    return convert_file("csv", "sql", csv_path, sql_path,
+                        read_options={"workers": workers},
+                        write_options=shard_options(shard_rows, shard_bytes, partition_by,
+                                                    table_name=table_name, infer_types=infer_types,
+                                                    sample_size=sample_size, dialect=dialect,
+                                                    rows_per_statement=rows_per_statement,
+                                                    max_statement_bytes=max_statement_bytes))
+
+def csv_to_txt(csv_path, txt_path, delimiter="|", shard_rows=None, shard_bytes=None, partition_by=None):
+    return convert_file("csv", "txt", csv_path, txt_path,
+                        write_options=shard_options(shard_rows, shard_bytes, partition_by,
+                                                    delimiter=delimiter))
+
+def json_to_csv(json_path, csv_path, ndjson=None, shard_rows=None, shard_bytes=None, partition_by=None):
+    return convert_file("json", "csv", json_path, csv_path,
+                        read_options={"ndjson": ndjson},
+                        write_options=shard_options(shard_rows, shard_bytes, partition_by))
+
+def json_to_sqlite(json_path, db_path, table_name="data", ndjson=None, bulk_load=False, indexes=None,
+                   infer_types=True, sample_size=TYPE_SAMPLE_SIZE, resume=False, incremental=False, keys=None,
+                   content_hash=False):
+    return convert_file("json", "sqlite", json_path, db_path,
+                        read_options={"ndjson": ndjson},
+                        write_options={"table_name": table_name, "bulk_load": bulk_load, "indexes": indexes,
+                                       "infer_types": infer_types, "sample_size": sample_size,
+                                       "resume": resume, "incremental": incremental,
+                                       "keys": keys, "content_hash": content_hash})
+
+def json_to_sql(json_path, sql_path, table_name="data", ndjson=None, infer_types=True,
+                sample_size=TYPE_SAMPLE_SIZE, dialect="sqlite", rows_per_statement=SQL_BATCH_SIZE,
+                max_statement_bytes=SQL_MAX_STATEMENT_BYTES, shard_rows=None, shard_bytes=None,
+                partition_by=None):
+    return convert_file("json", "sql", json_path, sql_path,
+                        read_options={"ndjson": ndjson},
+                        write_options=shard_options(shard_rows, shard_bytes, partition_by,
+                                                    table_name=table_name, infer_types=infer_types,
+                                                    sample_size=sample_size, dialect=dialect,
+                                                    rows_per_statement=rows_per_statement,
+                                                    max_statement_bytes=max_statement_bytes))
+
+def json_to_txt(json_path, txt_path, delimiter="|", ndjson=None, shard_rows=None, shard_bytes=None,
+                partition_by=None):
+    return convert_file("json", "txt", json_path, txt_path,
+                        read_options={"ndjson": ndjson},
+                        write_options=shard_options(shard_rows, shard_bytes, partition_by,
+                                                    delimiter=delimiter))
+
+def sqlite_to_csv(db_path, csv_path, table_name=None, fetch_size=SQLITE_FETCH_SIZE, all_tables=False,
+                  workers=None, columns=None, where=None, order_by=None, limit=None, query=None,
+                  partitions=None, shard=False, shard_rows=None, shard_bytes=None, partition_by=None):
+    return convert_file("sqlite", "csv", db_path, csv_path,
+                        read_options={"table_name": table_name, "fetch_size": fetch_size,
+                                      "all_tables": all_tables, "workers": workers, "columns": columns,
+                                      "where": where, "order_by": order_by, "limit": limit, "query": query,
+                                      "partitions": partitions, "shard": shard},
+                        write_options=shard_options(shard_rows, shard_bytes, partition_by))
+
+def sqlite_to_json(db_path, json_path, table_name=None, ndjson=None, indent=None,
+                   fetch_size=SQLITE_FETCH_SIZE, all_tables=False, workers=None, columns=None, where=None,
+                   order_by=None, limit=None, query=None, partitions=None, shard=False, shard_rows=None,
+                   shard_bytes=None, partition_by=None):
+    return convert_file("sqlite", "json", db_path, json_path,
+                        read_options={"table_name": table_name, "fetch_size": fetch_size,
+                                      "all_tables": all_tables, "workers": workers, "columns": columns,
+                                      "where": where, "order_by": order_by, "limit": limit, "query": query,
+                                      "partitions": partitions, "shard": shard},
+                        write_options=shard_options(shard_rows, shard_bytes, partition_by, ndjson=ndjson,
+                                                    indent=indent))
+
+def sqlite_to_sql(db_path, sql_path, table_name=None, fetch_size=SQLITE_FETCH_SIZE, all_tables=False,
+                  workers=None, columns=None, where=None, order_by=None, limit=None, query=None,
+                  partitions=None, shard=False, dialect="sqlite", rows_per_statement=SQL_BATCH_SIZE,
+                  max_statement_bytes=SQL_MAX_STATEMENT_BYTES, shard_rows=None, shard_bytes=None,
+                  partition_by=None):
+    return convert_file("sqlite", "sql", db_path, sql_path,
+                        read_options={"table_name": table_name, "fetch_size": fetch_size,
+                                      "all_tables": all_tables, "workers": workers, "columns": columns,
+                                      "where": where, "order_by": order_by, "limit": limit, "query": query,
+                                      "partitions": partitions, "shard": shard},
+                        write_options=shard_options(shard_rows, shard_bytes, partition_by, dialect=dialect,
+                                                    rows_per_statement=rows_per_statement,
+                                                    max_statement_bytes=max_statement_bytes))
+
+def sqlite_to_txt(db_path, txt_path, table_name=None, delimiter="|", fetch_size=SQLITE_FETCH_SIZE,
+                  all_tables=False, workers=None, columns=None, where=None, order_by=None, limit=None,
+                  query=None, partitions=None, shard=False, shard_rows=None, shard_bytes=None,
+                  partition_by=None):
+    return convert_file("sqlite", "txt", db_path, txt_path,
+                        read_options={"table_name": table_name, "fetch_size": fetch_size,
+                                      "all_tables": all_tables, "workers": workers, "columns": columns,
+                                      "where": where, "order_by": order_by, "limit": limit, "query": query,
+                                      "partitions": partitions, "shard": shard},
+                        write_options=shard_options(shard_rows, shard_bytes, partition_by,
+                                                    delimiter=delimiter))
+
+def sqlite_to_sqlite(db_path, target_path, table_name=None, target_table=None, columns=None, where=None):
+    # rows never leave the SQLite engine, so this bypasses the reader/writer pipeline
     try:
-        log(f"شروع تبدیل TXT به SQL", "INFO")
-        
-        if not os.path.exists(txt_path):
-            raise FileNotFoundError(f"فایل TXT یافت نشد: {txt_path}")
-        
-        with open(txt_path, 'r', encoding='utf-8') as txtfile:
-            lines = [line.strip() for line in txtfile if line.strip()]
-        
-        if not lines:
-            raise ValueError("فایل TXT خالی است")
-        
-        if not delimiter:
-            delimiters = ['|', ',', ';', '\t', ':', '#', '~']
-            max_count = 0
-            
-            for delim in delimiters:
-                count = lines[0].count(delim)
-                if count > max_count:
-                    max_count = count
-                    delimiter = delim
-        
-        log(f"جداکننده تشخیص داده شده: '{delimiter}'", "STATS")
-        
-        headers = lines[0].split(delimiter)
-        start_idx = 1
+        log("شروع کپی SQLite به SQLite", "INFO")
         
-        data = []
-        for line in lines[start_idx:]:
-            values = line.split(delimiter)
-            if len(values) == len(headers):
-                data.append(values)
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"فایل دیتابیس یافت نشد: {db_path}")
+        if os.path.abspath(db_path) == os.path.abspath(target_path):
+            raise ValueError("دیتابیس مبدأ و مقصد یکی هستند")
         
-        with open(sql_path, 'w', encoding='utf-8') as sqlfile:
-            sqlfile.write(f"-- ایجاد جدول {table_name}\n")
-            sqlfile.write(f"CREATE TABLE {table_name} (\n")
-            
-            columns = []
-            for header in headers:
-                columns.append(f"    {header} VARCHAR(255)")
-            
-            sqlfile.write(",\n".join(columns))
-            sqlfile.write("\n);\n\n")
-            
-            sqlfile.write(f"-- درج داده‌ها در جدول {table_name}\n")
-            
-            batch_size = 500
-            for i in range(0, len(data), batch_size):
-                batch = data[i:i+batch_size]
-                
-                sqlfile.write(f"INSERT INTO {table_name} ({', '.join(headers)}) VALUES\n")
-                
-                values_list = []
-                for row in batch:
-                    escaped_values = []
-                    for value in row:
-                        if not value:
-                            escaped_values.append("NULL")
-                        else:
-                            escaped = str(value).replace("'", "''")
-                            escaped_values.append(f"'{escaped}'")
-                    
-                    values_list.append(f"    ({', '.join(escaped_values)})")
-                
-                sqlfile.write(",\n".join(values_list))
-                sqlfile.write(";\n\n")
+        if isinstance(columns, str):
+            columns = [col.strip() for col in columns.split(',')]
+        tables = [table_name] if table_name else None
+        for copied_table, row_count in copy_sqlite_tables(db_path, target_path, tables, target_table, columns, where):
+            detail = f": {row_count} ردیف" if row_count is not None else ""
+            log(f"  • {copied_table}{detail}", "STATS")
         
-        log(f"فایل SQL با موفقیت ایجاد شد: {sql_path}", "SUCCESS")
-        log(f"  • تعداد INSERT statement: {(len(data) + batch_size - 1) // batch_size}", "STATS")
+        log(f"دیتابیس SQLite با موفقیت ایجاد شد: {target_path}", "SUCCESS")
         return True
         
     except Exception as e:
-        log(f"خطا در تبدیل TXT به SQL: {str(e)}", "ERROR")
+        log(f"خطا در کپی SQLite به SQLite: {str(e)}", "ERROR")
         return False
 
+def sql_backslash_escapes(dialect):
+    # only MySQL dumps escape with backslashes; without a dialect the dump itself is inspected
+    return None if dialect is None else dialect == "mysql"
+
+def sql_to_csv(sql_path, csv_path, all_tables=False, dialect=None, shard_rows=None, shard_bytes=None,
+               partition_by=None):
+    return convert_file("sql", "csv", sql_path, csv_path,
+                        read_options={"all_tables": all_tables,
+                                      "backslash_escapes": sql_backslash_escapes(dialect)},
+                        write_options=shard_options(shard_rows, shard_bytes, partition_by))
+
+def sql_to_json(sql_path, json_path, ndjson=None, indent=None, all_tables=False, dialect=None,
+                shard_rows=None, shard_bytes=None, partition_by=None):
+    return convert_file("sql", "json", sql_path, json_path,
+                        read_options={"all_tables": all_tables,
+                                      "backslash_escapes": sql_backslash_escapes(dialect)},
+                        write_options=shard_options(shard_rows, shard_bytes, partition_by, ndjson=ndjson,
+                                                    indent=indent))
+
+def sql_to_sqlite(sql_path, db_path, bulk_load=False, indexes=None, infer_types=True,
+                  sample_size=TYPE_SAMPLE_SIZE, keys=None, content_hash=False, all_tables=False,
+                  dialect=None):
+    return convert_file("sql", "sqlite", sql_path, db_path,
+                        read_options={"all_tables": all_tables,
+                                      "backslash_escapes": sql_backslash_escapes(dialect)},
+                        write_options={"bulk_load": bulk_load, "indexes": indexes,
+                                       "infer_types": infer_types, "sample_size": sample_size,
+                                       "keys": keys, "content_hash": content_hash})
+
+def sql_to_txt(sql_path, txt_path, delimiter="|", all_tables=False, dialect=None, shard_rows=None,
+               shard_bytes=None, partition_by=None):
+    return convert_file("sql", "txt", sql_path, txt_path,
+                        read_options={"all_tables": all_tables,
+                                      "backslash_escapes": sql_backslash_escapes(dialect)},
+                        write_options=shard_options(shard_rows, shard_bytes, partition_by,
+                                                    delimiter=delimiter))
+
+def txt_to_csv(txt_path, csv_path, delimiter=None, shard_rows=None, shard_bytes=None, partition_by=None):
+    return convert_file("txt", "csv", txt_path, csv_path,
+                        read_options={"delimiter": delimiter, "strict": False},
+                        write_options=shard_options(shard_rows, shard_bytes, partition_by))
+
+def txt_to_json(txt_path, json_path, delimiter=None, ndjson=None, indent=None, shard_rows=None,
+                shard_bytes=None, partition_by=None):
+    return convert_file("txt", "json", txt_path, json_path,
+                        read_options={"delimiter": delimiter},
+                        write_options=shard_options(shard_rows, shard_bytes, partition_by, ndjson=ndjson,
+                                                    indent=indent))
+
+def txt_to_sqlite(txt_path, db_path, table_name="data", delimiter=None, bulk_load=False, indexes=None,
+                  infer_types=True, sample_size=TYPE_SAMPLE_SIZE, workers=None, resume=False,
+                  incremental=False, keys=None, content_hash=False):
+    return convert_file("txt", "sqlite", txt_path, db_path,
+                        read_options={"delimiter": delimiter, "workers": workers},
+                        write_options={"table_name": table_name, "bulk_load": bulk_load, "indexes": indexes,
+                                       "infer_types": infer_types, "sample_size": sample_size,
+                                       "resume": resume, "incremental": incremental,
+                                       "keys": keys, "content_hash": content_hash})
+
+def txt_to_sql(txt_path, sql_path, table_name="data", delimiter=None, infer_types=True,
+               sample_size=TYPE_SAMPLE_SIZE, workers=None, dialect="sqlite",
+               rows_per_statement=SQL_BATCH_SIZE, max_statement_bytes=SQL_MAX_STATEMENT_BYTES,
+               shard_rows=None, shard_bytes=None, partition_by=None):
+    return convert_file("txt", "sql", txt_path, sql_path,
+                        read_options={"delimiter": delimiter, "workers": workers},
+                        write_options=shard_options(shard_rows, shard_bytes, partition_by,
+                                                    table_name=table_name, infer_types=infer_types,
+                                                    sample_size=sample_size, dialect=dialect,
+                                                    rows_per_statement=rows_per_statement,
+                                                    max_statement_bytes=max_statement_bytes))
+
 def get_output_filename(input_path, output_ext, default_name="output"):
-    input_name = os.path.basename(input_path)
+    input_name = os.path.basename(split_compression_ext(input_path)[0])
     name_without_ext = os.path.splitext(input_name)[0]
     
     safe_name = re.sub(r'[<>:"/\\|?*]', '_', name_without_ext)
@@ -1175,6 +2950,294 @@ def get_output_filename(input_path, output_ext, default_name="output"):
     else:
         return f"{default_name}.{output_ext}"
 
+CONVERSIONS = {
+    1: ("CSV به JSON", "csv_to_json", ["csv"], "json"),
+    2: ("CSV به SQLite", "csv_to_sqlite", ["csv"], "db"),
+    3: ("CSV به SQL", "csv_to_sql", ["csv"], "sql"),
+    4: ("CSV به TXT", "csv_to_txt", ["csv"], "txt"),
+    5: ("JSON به CSV", "json_to_csv", ["json", "ndjson", "jsonl"], "csv"),
+    6: ("JSON به SQLite", "json_to_sqlite", ["json", "ndjson", "jsonl"], "db"),
+    7: ("JSON به SQL", "json_to_sql", ["json", "ndjson", "jsonl"], "sql"),
+    8: ("JSON به TXT", "json_to_txt", ["json", "ndjson", "jsonl"], "txt"),
+    9: ("SQLite به CSV", "sqlite_to_csv", ["db", "sqlite", "sqlite3"], "csv"),
+    10: ("SQLite به JSON", "sqlite_to_json", ["db", "sqlite", "sqlite3"], "json"),
+    11: ("SQLite به SQL", "sqlite_to_sql", ["db", "sqlite", "sqlite3"], "sql"),
+    12: ("SQLite به TXT", "sqlite_to_txt", ["db", "sqlite", "sqlite3"], "txt"),
+    13: ("SQL به CSV", "sql_to_csv", ["sql"], "csv"),
+    14: ("SQL به JSON", "sql_to_json", ["sql"], "json"),
+    15: ("SQL به SQLite", "sql_to_sqlite", ["sql"], "db"),
+    16: ("SQL به TXT", "sql_to_txt", ["sql"], "txt"),
+    17: ("TXT به CSV", "txt_to_csv", ["txt", "text"], "csv"),
+    18: ("TXT به JSON", "txt_to_json", ["txt", "text"], "json"),
+    19: ("TXT به SQLite", "txt_to_sqlite", ["txt", "text"], "db"),
+    20: ("TXT به SQL", "txt_to_sql", ["txt", "text"], "sql")
+}
+
+FORMAT_EXTENSIONS = {func_name.split("_to_")[0]: input_exts for _, func_name, input_exts, _ in CONVERSIONS.values()}
+OUTPUT_EXTENSIONS = {func_name.split("_to_")[1]: output_ext for _, func_name, _, output_ext in CONVERSIONS.values()}
+
+def detect_input_format(path):
+    ext = os.path.splitext(split_compression_ext(path)[0])[1].lower().lstrip('.')
+    for fmt, exts in FORMAT_EXTENSIONS.items():
+        if ext in exts:
+            return fmt
+    return None
+
+def expand_input_paths(patterns, input_format=None):
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            exts = FORMAT_EXTENSIONS[input_format] if input_format else [e for exts in FORMAT_EXTENSIONS.values() for e in exts]
+            for name in sorted(os.listdir(pattern)):
+                path = os.path.join(pattern, name)
+                ext = os.path.splitext(split_compression_ext(name)[0])[1].lower().lstrip('.')
+                if os.path.isfile(path) and ext in exts:
+                    paths.append(path)
+        elif glob.has_magic(pattern):
+            paths.extend(sorted(p for p in glob.glob(pattern, recursive=True) if os.path.isfile(p)))
+        else:
+            paths.append(pattern)
+    
+    seen = set()
+    return [p for p in paths if not (p in seen or seen.add(p))]
+
+def resolve_sqlite_table(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        tables = list_sqlite_tables(conn)
+    finally:
+        conn.close()
+    
+    if len(tables) != 1:
+        raise ValueError(f"دیتابیس {len(tables)} جدول دارد؛ با --table یکی را انتخاب کنید")
+    return tables[0]
+
+def run_conversion_job(func_name, input_path, output_path, params):
+    start_time = time.time()
+    result = {"input": input_path, "output": output_path, "function": func_name}
+    
+    try:
+        func = globals()[func_name]
+        accepted = inspect.signature(func).parameters
+        call_params = {k: v for k, v in params.items() if k in accepted and v is not None}
+        
+        if func_name.startswith("sqlite_to_") and func_name != "sqlite_to_sqlite" and \
+                not (call_params.get("table_name") or call_params.get("all_tables") or call_params.get("query")):
+            call_params["table_name"] = resolve_sqlite_table(input_path)
+        
+        success = func(input_path, output_path, **call_params)
+    except Exception as e:
+        log(f"خطا در اجرای تابع: {str(e)}", "ERROR")
+        result["error"] = str(e)
+        success = False
+    
+    result["status"] = "ok" if success else "error"
+    result["exit_code"] = 0 if success else 1
+    result["seconds"] = round(time.time() - start_time, 3)
+    if success and os.path.isdir(output_path):
+        result["output_bytes"] = sum(os.path.getsize(os.path.join(root, name))
+                                     for root, _, names in os.walk(output_path) for name in names)
+    elif success and not os.path.exists(output_path) and os.path.exists(shard_manifest_path(output_path)):
+        with open(shard_manifest_path(output_path), encoding='utf-8') as f:
+            result["output_bytes"] = json.load(f)["bytes"]
+    else:
+        result["output_bytes"] = os.path.getsize(output_path) if success and os.path.exists(output_path) else None
+    return result
+
+def build_arg_parser():
+    formats = sorted(FORMAT_EXTENSIONS)
+    parser = argparse.ArgumentParser(prog="csv.py", description="Database & Format Converter")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    convert = subparsers.add_parser("convert", help="convert one or more files")
+    convert.add_argument("inputs", nargs="+", help="input files, directories or glob patterns")
+    convert.add_argument("--from", dest="input_format", choices=formats, help="input format (default: from extension)")
+    convert.add_argument("--to", dest="output_format", choices=formats, required=True, help="output format")
+    convert.add_argument("-o", "--output", help="output file, or directory for several inputs")
+    convert.add_argument("-j", "--workers", type=int, default=1, help="files converted concurrently")
+    convert.add_argument("--parse-workers", type=int, help="processes used to parse one large CSV/TXT file")
+    convert.add_argument("--table", help="table name to read or write")
+    convert.add_argument("--target-table", help="table name written by an SQLite to SQLite copy")
+    convert.add_argument("--columns", help="columns to read from SQLite, comma separated")
+    convert.add_argument("--where", help="SQL condition rows read from SQLite must meet")
+    convert.add_argument("--order-by", help="SQL ORDER BY expression for rows read from SQLite")
+    convert.add_argument("--limit", type=int, help="maximum rows read from SQLite")
+    convert.add_argument("--partitions", type=int, help="split an SQLite export into this many rowid ranges read in parallel")
+    convert.add_argument("--shard", action="store_true", help="with --partitions, write one output file per range")
+    convert.add_argument("--shard-rows", type=int, help="split each output into files of at most this many rows")
+    convert.add_argument("--shard-mb", type=float, help="split each output into files of about this many megabytes")
+    convert.add_argument("--partition-by", help="write a Hive-style directory per value of this column")
+    convert.add_argument("--query", help="SELECT statement whose result is exported instead of a table")
+    convert.add_argument("--all-tables", action="store_true", help="convert every table of an SQLite/SQL input, one output per table")
+    convert.add_argument("--delimiter", help="TXT delimiter")
+    convert.add_argument("--ndjson", action="store_true", default=None, help="read/write JSON Lines")
+    convert.add_argument("--bulk-load", action="store_true", help="fast SQLite load profile")
+    convert.add_argument("--resume", action="store_true", help="checkpoint SQLite loads and continue an interrupted one")
+    convert.add_argument("--incremental", action="store_true", help="only load rows appended since the last SQLite load")
+    convert.add_argument("--watch", type=float, metavar="SECONDS", help="poll the inputs and load new rows incrementally")
+    convert.add_argument("--dialect", choices=sorted(SQL_DIALECTS), help="SQL script flavour to write (default: sqlite) or read (default: detected)")
+    convert.add_argument("--rows-per-statement", type=int, help="rows per INSERT statement in SQL output")
+    convert.add_argument("--max-statement-bytes", type=int, help="size cap of one INSERT statement in SQL output")
+    convert.add_argument("--index", action="append", help="column(s) to index after an SQLite load, comma separated")
+    convert.add_argument("--key", help="upsert SQLite loads on these columns, comma separated")
+    convert.add_argument("--content-hash", action="store_true", help="with --key, skip rows whose content did not change")
+    convert.add_argument("--no-infer-types", dest="infer_types", action="store_false", help="keep every column as TEXT")
+    convert.add_argument("--sample-size", type=int, help="rows sampled for type inference")
+    convert.add_argument("--fetch-size", type=int, help="rows per fetchmany() when reading SQLite")
+    convert.add_argument("--compress", choices=sorted(COMPRESSION_SUFFIXES), help="compress outputs written to a directory")
+    convert.add_argument("-q", "--quiet", action="store_true", help="only log errors")
+    return parser
+
+def plan_jobs(args, inputs, params):
+    output_ext = OUTPUT_EXTENSIONS[args.output_format]
+    if args.compress and args.output_format != "sqlite":
+        output_ext = f"{output_ext}.{COMPRESSION_SUFFIXES[args.compress]}"
+    shared_output = (
+        args.output is not None
+        and not os.path.isdir(args.output)
+        and not args.output.endswith(os.sep)
+        and (len(inputs) == 1 or args.output_format == "sqlite")
+    )
+    output_dir = "." if args.output is None or shared_output else args.output
+    if not shared_output:
+        os.makedirs(output_dir, exist_ok=True)
+    
+    jobs = []
+    for input_path in inputs:
+        input_format = args.input_format or detect_input_format(input_path)
+        if not input_format:
+            jobs.append((None, input_path, None, None))
+            continue
+        
+        func_name = f"{input_format}_to_{args.output_format}"
+        job_params = dict(params, table_name=args.table)
+        if shared_output:
+            output_path = args.output
+            # a watched glob can match one file now and more later, so it always names tables per file
+            if (len(inputs) > 1 or args.watch is not None) and not args.table and input_format != "sqlite":
+                stem = os.path.splitext(os.path.basename(split_compression_ext(input_path)[0]))[0]
+                job_params["table_name"] = re.sub(r'\W', '_', stem) or "data"
+        elif args.all_tables and args.output_format != "sqlite":
+            # one directory per input holds a file for each of its tables
+            stem = os.path.splitext(os.path.basename(split_compression_ext(input_path)[0]))[0]
+            output_path = output_dir if args.output is not None and len(inputs) == 1 else os.path.join(output_dir, stem)
+        else:
+            output_path = os.path.join(output_dir, get_output_filename(input_path, output_ext))
+        jobs.append((func_name, input_path, output_path, job_params))
+    return jobs, shared_output
+
+def run_jobs(jobs, workers):
+    results = []
+    if workers == 1 or len(jobs) == 1:
+        futures = None
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        futures = [pool.submit(run_conversion_job, *job) if job[0] else None for job in jobs]
+    
+    try:
+        for i, job in enumerate(jobs):
+            if not job[0]:
+                result = {"input": job[1], "output": None, "function": None, "status": "error",
+                          "exit_code": 2, "seconds": 0.0, "output_bytes": None,
+                          "error": "unknown input format"}
+            elif futures:
+                result = futures[i].result()
+            else:
+                result = run_conversion_job(*job)
+            results.append(result)
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+    finally:
+        if pool:
+            pool.shutdown()
+    
+    return results
+
+def watch_inputs(args, params):
+    # stat() every input once per pass; only files whose size or mtime moved get a job
+    seen = {}
+    exit_code = 0
+    try:
+        while True:
+            inputs = expand_input_paths(args.inputs, args.input_format)
+            changed = []
+            for input_path in inputs:
+                try:
+                    stat = os.stat(input_path)
+                except OSError:
+                    continue
+                if seen.get(input_path) != (stat.st_size, stat.st_mtime_ns):
+                    seen[input_path] = (stat.st_size, stat.st_mtime_ns)
+                    changed.append(input_path)
+            
+            if changed:
+                # plan against every input so table names stay the same as in a full run
+                jobs, shared_output = plan_jobs(args, inputs, params)
+                results = run_jobs([job for job in jobs if job[1] in changed], 1)
+                exit_code = max(result["exit_code"] for result in results)
+            time.sleep(args.watch)
+    except KeyboardInterrupt:
+        log("پایش ورودی‌ها متوقف شد", "INFO")
+    return exit_code
+
+def run_cli(argv):
+    global LOG_STREAM, LOG_QUIET
+    
+    args = build_arg_parser().parse_args(argv)
+    LOG_STREAM = sys.stderr
+    LOG_QUIET = args.quiet
+    
+    if (args.incremental or args.watch) and args.output_format != "sqlite":
+        log("حالت افزایشی فقط برای خروجی SQLite پشتیبانی می‌شود", "ERROR")
+        return 2
+    if (args.shard_rows or args.shard_mb or args.partition_by) and args.output_format == "sqlite":
+        log("تقسیم خروجی به چند فایل برای SQLite پشتیبانی نمی‌شود", "ERROR")
+        return 2
+    
+    params = {
+        "delimiter": args.delimiter,
+        "ndjson": args.ndjson,
+        "bulk_load": args.bulk_load or None,
+        "indexes": [tuple(col.strip() for col in index.split(',')) for index in args.index] if args.index else None,
+        "infer_types": args.infer_types,
+        "sample_size": args.sample_size,
+        "fetch_size": args.fetch_size,
+        "workers": args.parse_workers,
+        "resume": args.resume or None,
+        "incremental": args.incremental or args.watch is not None or None,
+        "keys": [col.strip() for col in args.key.split(',')] if args.key else None,
+        "content_hash": args.content_hash or None,
+        "all_tables": args.all_tables or None,
+        "target_table": args.target_table,
+        "columns": [col.strip() for col in args.columns.split(',')] if args.columns else None,
+        "where": args.where,
+        "order_by": args.order_by,
+        "limit": args.limit,
+        "query": args.query,
+        "partitions": args.partitions,
+        "shard": args.shard or None,
+        "shard_rows": args.shard_rows,
+        "shard_bytes": int(args.shard_mb * 1024 * 1024) if args.shard_mb else None,
+        "partition_by": args.partition_by,
+        "dialect": args.dialect,
+        "rows_per_statement": args.rows_per_statement,
+        "max_statement_bytes": args.max_statement_bytes,
+    }
+    
+    if args.watch is not None:
+        return watch_inputs(args, params)
+    
+    inputs = expand_input_paths(args.inputs, args.input_format)
+    if not inputs:
+        log("هیچ فایل ورودی یافت نشد", "ERROR")
+        return 2
+    
+    jobs, shared_output = plan_jobs(args, inputs, params)
+    # several inputs loading into one SQLite file would only contend for its write lock
+    workers = 1 if shared_output else max(1, args.workers)
+    results = run_jobs(jobs, workers)
+    return max(result["exit_code"] for result in results)
+
 def show_menu():
     clear_screen()
     print_banner()
@@ -1238,30 +3301,7 @@ def main():
                 time.sleep(1)
                 break
             
-            conversions = {
-                1: ("CSV به JSON", "csv_to_json", ["csv"], "json"),
-                2: ("CSV به SQLite", "csv_to_sqlite", ["csv"], "db"),
-                3: ("CSV به SQL", "csv_to_sql", ["csv"], "sql"),
-                4: ("CSV به TXT", "csv_to_txt", ["csv"], "txt"),
-                5: ("JSON به CSV", "json_to_csv", ["json"], "csv"),
-                6: ("JSON به SQLite", "json_to_sqlite", ["json"], "db"),
-                7: ("JSON به SQL", "json_to_sql", ["json"], "sql"),
-                8: ("JSON به TXT", "json_to_txt", ["json"], "txt"),
-                9: ("SQLite به CSV", "sqlite_to_csv", ["db", "sqlite", "sqlite3"], "csv"),
-                10: ("SQLite به JSON", "sqlite_to_json", ["db", "sqlite", "sqlite3"], "json"),
-                11: ("SQLite به SQL", "sqlite_to_sql", ["db", "sqlite", "sqlite3"], "sql"),
-                12: ("SQLite به TXT", "sqlite_to_txt", ["db", "sqlite", "sqlite3"], "txt"),
-                13: ("SQL به CSV", "sql_to_csv", ["sql"], "csv"),
-                14: ("SQL به JSON", "sql_to_json", ["sql"], "json"),
-                15: ("SQL به SQLite", "sql_to_sqlite", ["sql"], "db"),
-                16: ("SQL به TXT", "sql_to_txt", ["sql"], "txt"),
-                17: ("TXT به CSV", "txt_to_csv", ["txt", "text"], "csv"),
-                18: ("TXT به JSON", "txt_to_json", ["txt", "text"], "json"),
-                19: ("TXT به SQLite", "txt_to_sqlite", ["txt", "text"], "db"),
-                20: ("TXT به SQL", "txt_to_sql", ["txt", "text"], "sql")
-            }
-            
-            conversion_name, func_name, input_exts, output_ext = conversions[choice]
+            conversion_name, func_name, input_exts, output_ext = CONVERSIONS[choice]
             
             clear_screen()
             print_banner()
@@ -1304,11 +3344,20 @@ def main():
                 if delim:
                     params['delimiter'] = delim
             
-            if func_name in ["csv_to_sqlite", "json_to_sqlite", "txt_to_sqlite", "sql_to_sqlite"]:
+            if func_name in ["csv_to_sqlite", "json_to_sqlite", "txt_to_sqlite"]:
                 table_name = input("📋 نام جدول (پیش‌فرض: data): ").strip()
                 if table_name:
                     params['table_name'] = table_name
             
+            if func_name in ["csv_to_sqlite", "json_to_sqlite", "txt_to_sqlite", "sql_to_sqlite"]:
+                bulk = input("⚡ بارگذاری سریع (PRAGMA + تراکنش واحد)؟ (y/n، پیش‌فرض: n): ").strip().lower()
+                if bulk == 'y':
+                    params['bulk_load'] = True
+                
+                index_columns = input("🗂️  ستون‌های ایندکس پس از بارگذاری (با کاما، Enter برای هیچ): ").strip()
+                if index_columns:
+                    params['indexes'] = [col.strip() for col in index_columns.split(',') if col.strip()]
+            
             if func_name in ["csv_to_sql", "json_to_sql", "txt_to_sql"]:
                 table_name = input("📋 نام جدول در خروجی SQL (پیش‌فرض: data): ").strip()
                 if table_name:
@@ -1364,6 +3413,9 @@ def main():
             input("\nبرای ادامه Enter بزنید...")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
+    
     try:
         main()
     except Exception as e: